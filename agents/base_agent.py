@@ -1,24 +1,119 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
+import asyncio
+import functools
+import json
+import time
 from datetime import datetime, timedelta
 import os
-import json
-import redis
-import hashlib
+import orjson
+import ormsgpack
+import xxhash
 import re
-from langchain_chroma import Chroma
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-from langchain_chroma import Chroma
-from langchain_openai import AzureOpenAIEmbeddings
+from utils.helpers import with_ts_epoch
 from utils.tools import XSearchTool
-from database.vector_db import ChromaDBManager
 from config import Config
 
 # Load environment variables from .env file
 load_dotenv()
 
+# MessagePack options for cached payloads: numpy scalars/arrays from analysis code and
+# non-string dict keys (e.g. integer counters) serialize without a pre-pass.
+_CACHE_PACK_OPTIONS = ormsgpack.OPT_SERIALIZE_NUMPY | ormsgpack.OPT_NON_STR_KEYS
+
+
+def _unpack_cached(value: bytes) -> Optional[Dict[str, Any]]:
+    """Decode a cached MessagePack payload; undecodable entries (e.g. legacy JSON) count as misses."""
+    try:
+        result = ormsgpack.unpackb(value)
+    except ormsgpack.MsgpackDecodeError:
+        return None
+    return result if isinstance(result, dict) else None
+
+
+_MISSING = object()
+
+
+def _configure_agent_logger() -> None:
+    """Attach the console handler to the "agent" parent logger once; per-agent loggers propagate to it."""
+    logger = logging.getLogger("agent")
+    if logger.handlers:
+        return
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+
+
+_configure_agent_logger()
+
+_CODE_FENCE_RE = re.compile(r'```(?:json)?\s*')
+_JSON_DECODER = json.JSONDecoder()
+
+
+@functools.lru_cache(maxsize=None)
+def _agent_config(agent_type: str, key: str) -> Any:
+    """Memoized Config.get_agent_config lookup; returns _MISSING when the key is not configured."""
+    return Config.get_agent_config(agent_type, key, _MISSING)
+
+
+# Process-wide client factories: every agent built with the same settings shares one
+# client and therefore one HTTP session / connection pool. The client libraries are
+# imported here rather than at module load so importing an agent stays cheap.
+@functools.lru_cache(maxsize=None)
+def _get_llm(model: Optional[str], temperature: float, api_key: Optional[str]):
+    from langchain_groq import ChatGroq
+    from utils.http_clients import get_http_clients
+    http_client, http_async_client = get_http_clients()
+    return ChatGroq(
+        model=model,
+        temperature=temperature,
+        groq_api_key=api_key,
+        http_client=http_client,
+        http_async_client=http_async_client
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_embeddings(api_key: Optional[str], endpoint: Optional[str], deployment: Optional[str],
+                    dimensions: Optional[int] = None):
+    from langchain_openai import AzureOpenAIEmbeddings
+    from utils.http_clients import get_http_clients
+    http_client, http_async_client = get_http_clients()
+    return AzureOpenAIEmbeddings(
+        model="text-embedding-3-small",
+        api_key=api_key,
+        azure_endpoint=endpoint,
+        azure_deployment=deployment,
+        dimensions=dimensions,
+        http_client=http_client,
+        http_async_client=http_async_client
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_redis(host: str, port: int):
+    import redis
+    import socket
+    # TCP_KEEPIDLE is Linux-specific; other platforms fall back to OS keepalive defaults
+    keepalive_options = {}
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        keepalive_options[socket.TCP_KEEPIDLE] = Config.REDIS_KEEPALIVE_IDLE
+    pool = redis.ConnectionPool(
+        host=host,
+        port=port,
+        max_connections=Config.REDIS_MAX_CONNECTIONS,
+        socket_keepalive=True,
+        socket_keepalive_options=keepalive_options,
+        socket_timeout=Config.REDIS_SOCKET_TIMEOUT,
+        health_check_interval=Config.REDIS_HEALTH_CHECK_INTERVAL,
+        decode_responses=False
+    )
+    # redis.Redis is thread-safe; every agent shares this client and its pool
+    return redis.Redis(connection_pool=pool)
+
 class BaseAgent(ABC):
     """Base class for FintelliUG agents, providing shared functionality for NLP, vector storage, logging, and caching.
 
@@ -26,20 +121,18 @@ class BaseAgent(ABC):
     fintech-related data in Uganda.
     """
 
+    _REQUIRED_INPUT_FIELDS = frozenset(('text', 'source', 'timestamp'))
+
     def __init__(self, name: str, agent_type: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
         """Initialize the agent with Groq LLM, ChromaDB, Redis, and Azure embeddings from .env.
         """
         self.name = name
-        self.agent_type =agent_type or name.lower().replace(' ', '_')
+        self.agent_type = agent_type or name.lower().replace(' ', '_')
+        # Resolved once here; vector_db and any logging reuse it
+        self.collection_name = Config.AGENT_COLLECTIONS.get(self.agent_type, f"fintelliug_{self.agent_type}")
 
-        # Initializes logger early 
+        # Initializes logger early; handlers live on the "agent" parent configured at import
         self.logger = logging.getLogger(f"agent.{name}")
-        if not self.logger.handlers:
-            self.logger.setLevel(logging.INFO)
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
         required_env_vars = [
             "GROQ_API_KEY", "AZURE_OPENAI_API_KEY", "AZURE_EMBEDDING_ENDPOINT",
             "AZURE_EMBEDDING_BASE"
@@ -48,56 +141,9 @@ class BaseAgent(ABC):
         if missing_vars:
             raise ValueError(f"Missing required environment variables: {missing_vars}")
 
-        self.llm = ChatGroq(
-            model=os.getenv("GROQ_MODEL"),
-            temperature=float(os.getenv("GROQ_TEMPERATURE", 0.7)),
-            groq_api_key=os.getenv("GROQ_API_KEY")
-        )
-        
-        # Initialize LLM with tools support for advanced agents
-        try:
-            self.llm_with_tools = ChatGroq(
-                model=os.getenv("GROQ_MODEL"),
-                temperature=float(os.getenv("GROQ_TEMPERATURE", 0.7)),
-                groq_api_key=os.getenv("GROQ_API_KEY")
-            )
-            self.logger.info("LLM with tools initialized successfully")
-        except Exception as e:
-            self.logger.error(f"Failed to initialize LLM with tools: {str(e)}")
-            self.llm_with_tools = None
-        self.embeddings = AzureOpenAIEmbeddings(
-            model="text-embedding-3-small",
-            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-            azure_endpoint=os.getenv("AZURE_EMBEDDING_ENDPOINT"),
-            azure_deployment=os.getenv("AZURE_EMBEDDING_BASE")
-        )
-         # Initialize ChromaDBManager with agent-specific collection
-        collection_name = Config.AGENT_COLLECTIONS.get(
-            self.agent_type, 
-            f"fintelliug_{self.agent_type}"
-        )
-        self.db_manager = ChromaDBManager(collection_name=collection_name)
-        
-        # Keep existing LangChain ChromaDB for backward compatibility
-        langchain_collection_name = f"fintelliug_{self.name.lower().replace(' ', '_')}"
-        persist_dir = os.getenv("CHROMA_PERSIST_DIR", "chroma_db")
-        
-        try:
-            self.vector_store = Chroma(
-                collection_name=langchain_collection_name,
-                embedding_function=self.embeddings,
-                persist_directory=persist_dir
-            )
-            self.logger.info(f"Initialized LangChain ChromaDB collection: {langchain_collection_name}")
-            self.logger.info(f"Initialized ChromaDBManager collection: {collection_name}")
-        except Exception as e:
-            self.logger.error(f"Failed to initialize ChromaDB: {str(e)}")
-            self.vector_store = None
-        self.redis_client = redis.Redis(
-            host=os.getenv("REDIS_HOST", "localhost"),
-            port=int(os.getenv("REDIS_PORT", 6379)),
-            decode_responses=True
-        )
+        # Deprecated: the LangChain Chroma wrapper opened the same persistent store a second
+        # time; kept as None so external references keep working. Use self.vector_db instead.
+        self.vector_store = None
         
         # Initialize the XSearchTool for social data collection
         try:
@@ -107,6 +153,59 @@ class BaseAgent(ABC):
             self.logger.error(f"Failed to initialize XSearchTool: {str(e)}")
             self.x_search_tool = None
 
+    # Clients are built on first access so agents only pay for the stacks they use.
+    # Plain assignment (e.g. self.db_manager = DatabaseManager()) overrides them per instance.
+
+    @functools.cached_property
+    def llm(self):
+        """Shared Groq chat model."""
+        return _get_llm(
+            os.getenv("GROQ_MODEL"),
+            float(os.getenv("GROQ_TEMPERATURE", 0.7)),
+            os.getenv("GROQ_API_KEY")
+        )
+
+    def llm_for_model(self, model: Optional[str] = None):
+        """Shared Groq chat model for a specific model name; the agent's default model when None."""
+        if not model or model in (os.getenv("GROQ_MODEL"), Config.GROQ_MODEL):
+            return self.llm
+        return _get_llm(model, float(os.getenv("GROQ_TEMPERATURE", 0.7)), os.getenv("GROQ_API_KEY"))
+
+    @functools.cached_property
+    def llm_with_tools(self):
+        """Tool-calling agents use the same shared client; tools are bound per call."""
+        return self.llm
+
+    @functools.cached_property
+    def embeddings(self):
+        """Shared Azure OpenAI embeddings client."""
+        return _get_embeddings(
+            os.getenv("AZURE_OPENAI_API_KEY"),
+            os.getenv("AZURE_EMBEDDING_ENDPOINT"),
+            os.getenv("AZURE_EMBEDDING_BASE"),
+            Config.EMBEDDING_DIMENSIONS
+        )
+
+    @functools.cached_property
+    def vector_db(self):
+        """ChromaDBManager for this agent's collection."""
+        from database.vector_db import ChromaDBManager
+        self.logger.info(f"Initialized ChromaDBManager collection: {self.collection_name}")
+        return ChromaDBManager(collection_name=self.collection_name)
+
+    @functools.cached_property
+    def db_manager(self):
+        """Defaults to the Chroma manager; some agents replace it with the SQL DatabaseManager."""
+        return self.vector_db
+
+    @functools.cached_property
+    def redis_client(self):
+        """Shared Redis client."""
+        return _get_redis(
+            os.getenv("REDIS_HOST", "localhost"),
+            int(os.getenv("REDIS_PORT", 6379))
+        )
+
     @abstractmethod
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process input data and return insights using a functional-style pipeline.
@@ -128,51 +227,183 @@ class BaseAgent(ABC):
         Returns:
             bool: True if valid, False otherwise.
         """
-        required_fields = ['text', 'source', 'timestamp']
-        is_valid = all(field in input_data for field in required_fields)
-        if not is_valid:
-            self.logger.error(f"Invalid input data: missing fields {required_fields}")
-        return is_valid
+        if self._REQUIRED_INPUT_FIELDS.issubset(input_data):
+            return True
+        missing = sorted(self._REQUIRED_INPUT_FIELDS.difference(input_data))
+        self.logger.error(f"Invalid input data: missing fields {missing}")
+        return False
+
+    def store_in_vector_db(self, items: List[Tuple[str, Dict[str, Any], str]], batch_size: int = 256):
+        """Store a batch of texts and metadata in ChromaDB for similarity search.
 
-    def store_in_vector_db(self, text: str, metadata: Dict[str, Any], doc_id: str):
-        """Store text and metadata in ChromaDB for similarity search.
+        Documents are submitted in slices of ``batch_size`` so each slice costs a single
+        embedding request and a single index update instead of one per document.
 
         Args:
-            text (str): Text to embed and store.
-            metadata (Dict[str, Any]): Metadata (e.g., source, timestamp).
-            doc_id (str): Unique identifier for the document.
+            items (List[Tuple[str, Dict[str, Any], str]]): (text, metadata, doc_id) tuples to store.
+            batch_size (int): Maximum number of documents per ChromaDB write (default: 256).
         """
-        if self.vector_store is None:
+        collection = self._vector_collection()
+        if collection is None:
             self.logger.warning("Vector store not initialized - skipping storage")
             return
-            
+        if not items:
+            return
+
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            texts = [text for text, _, _ in batch]
+            try:
+                collection.upsert(
+                    ids=[doc_id for _, _, doc_id in batch],
+                    embeddings=self.embeddings.embed_documents(texts),
+                    documents=texts,
+                    metadatas=[with_ts_epoch(metadata) for _, metadata, _ in batch]
+                )
+                self.logger.info(f"Stored {len(batch)} documents in ChromaDB")
+            except Exception as e:
+                self.logger.error(f"Failed to store batch in ChromaDB: {str(e)}")
+
+    async def embed_and_store_async(self, items: List[Tuple[str, Dict[str, Any], str]], chunk_size: int = 128):
+        """Embed documents with concurrent requests, then write them to ChromaDB in one call.
+
+        Embedding is network-bound, so chunks are sent to Azure OpenAI concurrently and
+        the resulting vectors are added to the collection together.
+
+        Args:
+            items (List[Tuple[str, Dict[str, Any], str]]): (text, metadata, doc_id) tuples to store.
+            chunk_size (int): Number of texts per embedding request (default: 128).
+        """
+        collection = self._vector_collection()
+        if collection is None:
+            self.logger.warning("Vector store not initialized - skipping storage")
+            return
+        if not items:
+            return
+
+        texts = [text for text, _, _ in items]
+        chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
         try:
-            self.vector_store.add_texts(texts=[text], metadatas=[metadata], ids=[doc_id])
-            self.logger.info(f"Stored document {doc_id} in ChromaDB")
+            chunk_vectors = await asyncio.gather(
+                *(self.embeddings.aembed_documents(chunk) for chunk in chunks)
+            )
+            embeddings = [vector for vectors in chunk_vectors for vector in vectors]
+            collection.upsert(
+                ids=[doc_id for _, _, doc_id in items],
+                embeddings=embeddings,
+                documents=texts,
+                metadatas=[with_ts_epoch(metadata) for _, metadata, _ in items]
+            )
+            self.logger.info(f"Stored {len(items)} documents in ChromaDB ({len(chunks)} embedding requests)")
         except Exception as e:
-            self.logger.error(f"Failed to store in ChromaDB: {str(e)}")
+            self.logger.error(f"Failed to store documents in ChromaDB: {str(e)}")
+
+    def store_in_vector_db_bulk(self, items: List[Tuple[str, Dict[str, Any], str]], chunk_size: int = 128):
+        """Synchronous entry point for embed_and_store_async.
+
+        Args:
+            items (List[Tuple[str, Dict[str, Any], str]]): (text, metadata, doc_id) tuples to store.
+            chunk_size (int): Number of texts per embedding request (default: 128).
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            from utils.http_clients import run_sync
+            run_sync(self.embed_and_store_async(items, chunk_size))
+            return
+        # Already inside an event loop (e.g. an async caller); fall back to the batched sync path
+        self.store_in_vector_db(items)
 
-    def query_vector_db(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+    def query_vector_db(self, query: str, k: int = 5, filter: Optional[Dict[str, Any]] = None,
+                        text_chars: Optional[int] = None) -> List[Dict[str, Any]]:
         """Query ChromaDB for similar documents.
 
         Args:
             query (str): Query text for similarity search.
             k (int): Number of results to return (default: 5).
+            filter (Optional[Dict[str, Any]]): Chroma ``where`` metadata predicate evaluated by the
+                store (e.g. ``{"ts_epoch": {"$gte": cutoff}}``).
+            text_chars (Optional[int]): If set, keep only the first ``text_chars`` characters of each
+                document so callers that need a head of the text do not carry full documents around.
 
         Returns:
             List[Dict[str, Any]]: List of matching documents with text, metadata, and scores.
         """
-        if self.vector_store is None:
+        collection = self._vector_collection()
+        if collection is None:
             self.logger.warning("Vector store not initialized - returning empty results")
             return []
-            
+
         try:
-            results = self.vector_store.similarity_search_with_score(query, k=k)
-            return [{"text": doc.page_content, "metadata": doc.metadata, "score": score} for doc, score in results]
+            results = collection.query(
+                query_embeddings=[self.embeddings.embed_query(query)],
+                n_results=k,
+                where=filter,
+                include=["documents", "metadatas", "distances"]
+            )
+            documents = results["documents"][0]
+            if text_chars is not None:
+                documents = [(text or "")[:text_chars] for text in documents]
+            return [
+                {"text": text, "metadata": metadata, "score": distance}
+                for text, metadata, distance in zip(documents, results["metadatas"][0], results["distances"][0])
+            ]
         except Exception as e:
             self.logger.error(f"ChromaDB query failed: {str(e)}")
             return []
 
+    def rerank_mmr(self, query: str, k: int = 5, fetch_k: int = 20, lambda_mult: float = 0.5,
+                   filter: Optional[Dict[str, Any]] = None, text_chars: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Query ChromaDB and re-rank the candidates with Maximal Marginal Relevance.
+
+        Args:
+            query (str): Query text for similarity search.
+            k (int): Number of results to return (default: 5).
+            fetch_k (int): Number of nearest candidates to re-rank (default: 20).
+            lambda_mult (float): Relevance/diversity trade-off, 1.0 = pure relevance (default: 0.5).
+            filter (Optional[Dict[str, Any]]): Chroma ``where`` predicate applied to the candidates.
+            text_chars (Optional[int]): If set, keep only the first ``text_chars`` characters of each document.
+
+        Returns:
+            List[Dict[str, Any]]: Diverse matching documents with text, metadata, and scores.
+        """
+        collection = self._vector_collection()
+        if collection is None:
+            self.logger.warning("Vector store not initialized - returning empty results")
+            return []
+
+        try:
+            from utils.rerank import mmr
+            query_embedding = self.embeddings.embed_query(query)
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=max(k, fetch_k),
+                where=filter,
+                include=["documents", "metadatas", "distances", "embeddings"]
+            )
+            documents = results["documents"][0]
+            if not documents:
+                return []
+            metadatas = results["metadatas"][0]
+            distances = results["distances"][0]
+            selected = mmr(query_embedding, results["embeddings"][0], k=k, lambda_mult=lambda_mult)
+            return [
+                {
+                    "text": documents[i][:text_chars] if text_chars else documents[i],
+                    "metadata": metadatas[i],
+                    "score": distances[i]
+                }
+                for i in selected
+            ]
+        except Exception as e:
+            self.logger.error(f"ChromaDB MMR query failed: {str(e)}")
+            return []
+
+    def _vector_collection(self):
+        """Return the native ChromaDB collection backing this agent, or None if unavailable."""
+        vector_db = getattr(self, "vector_db", None)
+        return getattr(vector_db, "collection", None)
+
     def cache_result(self, key: str, result: Dict[str, Any], ttl: int = 3600):
         """Cache processing result in Redis with a time-to-live (TTL).
 
@@ -182,7 +413,7 @@ class BaseAgent(ABC):
             ttl (int): Time-to-live in seconds (default: 1 hour).
         """
         try:
-            self.redis_client.setex(key, ttl, json.dumps(result))
+            self.redis_client.setex(key, ttl, ormsgpack.packb(result, option=_CACHE_PACK_OPTIONS))
             self.logger.debug(f"Cached result for key {key}")
         except Exception as e:
             self.logger.error(f"Failed to cache result: {str(e)}")
@@ -199,22 +430,65 @@ class BaseAgent(ABC):
         try:
             cached = self.redis_client.get(key)
             if cached:
-                self.logger.debug(f"Retrieved cached result for key {key}")
-                return json.loads(cached)
+                result = _unpack_cached(cached)
+                if result is not None:
+                    self.logger.debug(f"Retrieved cached result for key {key}")
+                return result
             return None
         except Exception as e:
             self.logger.error(f"Failed to retrieve cache: {str(e)}")
             return None
 
-    def log_performance(self, start_time: datetime, result: Dict[str, Any]):
+    def cache_results_bulk(self, items: Dict[str, Dict[str, Any]], ttl: int = 3600):
+        """Cache several results in Redis using a single pipelined round-trip.
+
+        Args:
+            items (Dict[str, Dict[str, Any]]): Mapping of cache key to result.
+            ttl (int): Time-to-live in seconds applied to every key (default: 1 hour).
+        """
+        if not items:
+            return
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, result in items.items():
+                pipe.setex(key, ttl, ormsgpack.packb(result, option=_CACHE_PACK_OPTIONS))
+            pipe.execute()
+            self.logger.debug(f"Cached {len(items)} results")
+        except Exception as e:
+            self.logger.error(f"Failed to cache results: {str(e)}")
+
+    def get_cached_results_bulk(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Retrieve several cached results from Redis using a single pipelined round-trip.
+
+        Args:
+            keys (List[str]): Cache keys to look up.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Cached results for the keys that were found; misses are omitted.
+        """
+        if not keys:
+            return {}
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipe.get(key)
+            values = pipe.execute()
+            decoded = ((key, _unpack_cached(value)) for key, value in zip(keys, values) if value)
+            found = {key: result for key, result in decoded if result is not None}
+            self.logger.debug(f"Retrieved {len(found)}/{len(keys)} cached results")
+            return found
+        except Exception as e:
+            self.logger.error(f"Failed to retrieve cache: {str(e)}")
+            return {}
+
+    def log_performance(self, start_time: float, result: Dict[str, Any]):
         """Log agent performance metrics.
 
         Args:
-            start_time (datetime): Start time of processing.
+            start_time (float): ``time.perf_counter()`` reading taken when processing started.
             result (Dict[str, Any]): Processing result.
         """
-        end_time = datetime.now()
-        processing_time = (end_time - start_time).total_seconds()
+        processing_time = time.perf_counter() - start_time
         insights_count = len(result.get('insights', []))
         self.logger.info(f"{self.name} processed data in {processing_time:.2f}s")
         self.logger.info(f"Generated {insights_count} insights")
@@ -234,10 +508,18 @@ class BaseAgent(ABC):
             self.logger.warning("XSearchTool not available - cannot fetch social data")
             return []
         
+        # Identical searches within the TTL (e.g. workflow re-plans) are served from Redis
+        cache_key = f"xsearch:{xxhash.xxh3_128_hexdigest(f'{max_results}:{query}'.encode())}"
+        cached = self.get_cached_result(cache_key)
+        if cached is not None:
+            self.logger.info(f"Returning cached social data for query: {query}")
+            return cached.get('posts', [])
+
         try:
             self.logger.info(f"Fetching social data for query: {query}")
             posts = self.x_search_tool.run(query, max_results)
             self.logger.info(f"Successfully fetched {len(posts)} social media posts")
+            self.cache_result(cache_key, {'posts': posts}, ttl=Config.X_SEARCH_CACHE_TTL)
             return posts
         except Exception as e:
             self.logger.error(f"Failed to fetch social data: {str(e)}")
@@ -246,22 +528,33 @@ class BaseAgent(ABC):
     def create_document_id(self, text: str, source: Optional[str] = None) -> str:
         """Create a unique document ID for vector storage."""
         content = f"{text}:{source}" if source else text
-        return hashlib.md5(content.encode()).hexdigest()
+        return xxhash.xxh3_128_hexdigest(content.encode())
 
     def extract_json_from_response(self, response_text: str) -> dict:
         """Extract JSON from LLM response, handling markdown formatting."""
-        if not response_text:
+        if not response_text or '{' not in response_text:
             return {}
-        
+
+        # Fast path: JSON-mode and well-behaved responses are a bare object, so parse
+        # the whole text directly and skip the fence stripping and regex scan
+        stripped = response_text.strip()
+        if stripped.startswith('{'):
+            try:
+                parsed = orjson.loads(stripped)
+                if isinstance(parsed, dict):
+                    return parsed
+            except orjson.JSONDecodeError:
+                pass
+
         # Remove markdown code blocks
-        cleaned = re.sub(r'```(?:json)?\s*', '', response_text)
+        cleaned = _CODE_FENCE_RE.sub('', response_text)
         cleaned = cleaned.replace('```', '').strip()
         
-        # Try to find JSON in the response
-        json_match = re.search(r'\{.*\}', cleaned, re.DOTALL)
-        if json_match:
+        # Decode the object starting at the first '{' in place; trailing prose is ignored
+        start = cleaned.find('{')
+        if start >= 0:
             try:
-                return json.loads(json_match.group())
+                return _JSON_DECODER.raw_decode(cleaned, start)[0]
             except json.JSONDecodeError:
                 pass
         
@@ -269,17 +562,76 @@ class BaseAgent(ABC):
 
     def get_config_value(self, key: str, default=None):
         """Get configuration value with fallback."""
-        return Config.get_agent_config(self.agent_type, key, default)
+        value = _agent_config(self.agent_type, key)
+        return default if value is _MISSING else value
+
+    def backfill_ts_epoch(self, page_size: int = 1000) -> int:
+        """One-time migration adding ``ts_epoch`` to stored records that only have an ISO ``timestamp``.
+
+        The retention delete filters on ``ts_epoch``, so records written before the field
+        existed never expire until this has run. It scans the whole collection (metadata
+        only, in pages), so run it once after upgrading rather than on every sweep; records
+        already carrying ``ts_epoch`` are left untouched.
+
+        Returns:
+            int: Number of records updated.
+        """
+        collection = self._vector_collection()
+        updated = 0
+        undated = 0
+        offset = 0
+        while True:
+            page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            ids = page.get("ids") or []
+            if not ids:
+                break
+            backfill_ids, backfill_metadatas = [], []
+            for doc_id, metadata in zip(ids, page.get("metadatas") or []):
+                metadata = metadata or {}
+                if "ts_epoch" in metadata:
+                    continue
+                dated = with_ts_epoch(metadata)
+                if "ts_epoch" in dated:
+                    backfill_ids.append(doc_id)
+                    backfill_metadatas.append(dated)
+                else:
+                    undated += 1
+            if backfill_ids:
+                collection.update(ids=backfill_ids, metadatas=backfill_metadatas)
+                updated += len(backfill_ids)
+            offset += len(ids)
+        if updated:
+            self.logger.info(f"Backfilled ts_epoch on {updated} records")
+        if undated:
+            self.logger.warning(f"{undated} records have no parseable timestamp and cannot be aged out")
+        return updated
 
-    def delete_old_records(self, cutoff_days: int = 90) -> bool:
-        """Delete ChromaDB records older than specified days (default: 90 days) for compliance with Uganda's Data Protection Act."""
+    def delete_old_records(self, cutoff_days: int = 90, verify: bool = False, backfill: bool = False) -> bool:
+        """Delete ChromaDB records older than specified days (default: 90 days) for compliance with Uganda's Data Protection Act.
+
+        Args:
+            cutoff_days (int): Age in days beyond which records are deleted.
+            verify (bool): If True, run a single ``limit=1`` lookup afterwards to confirm no
+                expired records remain, instead of counting the whole collection.
+            backfill (bool): If True, run ``backfill_ts_epoch`` first so records stored before
+                ``ts_epoch`` existed are aged out too. This scans the whole collection.
+
+        Returns:
+            bool: True if the delete was issued (and, when verifying, nothing expired remains).
+        """
         try:
-            cutoff = (datetime.now() - timedelta(days=cutoff_days)).isoformat()
-            total_before = self.vector_store._collection.count()
-            self.vector_store.delete(where={"timestamp": {"$lt": cutoff}})
-            total_after = self.vector_store._collection.count()
-            deleted_count = total_before - total_after
-            self.logger.info(f"Deleted {deleted_count} records older than {cutoff_days} days")
+            cutoff = (datetime.now() - timedelta(days=cutoff_days)).timestamp()
+            where = {"ts_epoch": {"$lt": cutoff}}
+            if backfill:
+                self.backfill_ts_epoch()
+            collection = self._vector_collection()
+            collection.delete(where=where)
+            self.logger.info(f"Delete issued for records older than {cutoff_days} days")
+            if verify:
+                remaining = collection.get(where=where, limit=1, include=[])
+                if remaining.get("ids"):
+                    self.logger.warning(f"Records older than {cutoff_days} days still present after delete")
+                    return False
             return True
         except Exception as e:
             self.logger.error(f"Failed to delete old records: {str(e)}")
@@ -1,9 +1,104 @@
 from .base_agent import BaseAgent
-from typing import Dict, List, Any
-from datetime import datetime, timedelta
-import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import re
+import string
+import textwrap
+import threading
+import time
+from cachetools import TTLCache
+import numpy as np
+import orjson
+import pandas as pd
+import xxhash
 from config import Config
+from utils.helpers import chunk_list, extract_json_block, recent_filter
+
+_SENTIMENT_LABELS = ["positive", "negative", "neutral"]
+# URLs are dropped from prompt snippets and whitespace runs collapsed, in one sub
+_PROMPT_NOISE_RE = re.compile(r"(?P<url>https?://\S+\s*)|\s+")
+# Groq JSON mode: the model must answer with a single JSON object, so no prose to strip
+_JSON_MODE = {"type": "json_object"}
+_SNIPPET_BEFORE = 500
+_SNIPPET_AFTER = 1000
+# Head of each retrieved document kept for per-competitor analysis (prompt window + context)
+_MENTION_TEXT_CHARS = 2048
+# Fixed instructions of the batched sentiment prompt. They come first and the per-batch
+# posts/items last, so every batch request starts with the same prefix for provider-side reuse.
+_BATCH_PROMPT_HEADER = textwrap.dedent("""\
+    Analyze these social media contents mentioning competitors in Uganda's fintech market.
+    Each item names the competitor to assess in the referenced post.
+
+    Return a JSON object whose "results" array has one object per item, using the item's id:
+    {
+        "results": [
+            {
+                "id": 0,
+                "sentiment": "positive/negative/neutral",
+                "key_points": ["insight1", "insight2"],
+                "confidence": 0.8,
+                "competitive_aspect": "pricing/features/service/brand"
+            }
+        ]
+    }
+
+    Focus on: customer sentiment, product features, pricing, service quality, competitive positioning.
+    Only return the JSON object, no other text.
+
+    """)
+# Single-mention sentiment prompt, dedented once at import; calls only substitute the fields
+_SENTIMENT_PROMPT = string.Template(textwrap.dedent("""\
+    Analyze this social media content mentioning $competitor in Uganda's fintech market:
+
+    Content: $content
+
+    Provide analysis in JSON format:
+    {
+        "sentiment": "positive/negative/neutral",
+        "key_points": ["insight1", "insight2"],
+        "confidence": 0.8,
+        "competitive_aspect": "pricing/features/service/brand"
+    }
+
+    Focus on: customer sentiment, product features, pricing, service quality, competitive positioning.
+    """))
+
+
+def _prompt_snippet(content: str, competitors: List[str]) -> str:
+    """Return a bounded window of content spanning the competitor mentions for LLM prompts."""
+    content_lower = content.lower()
+    positions = [pos for pos in (content_lower.find(c.lower()) for c in competitors) if pos >= 0] or [0]
+    snippet = content[max(0, min(positions) - _SNIPPET_BEFORE):max(positions) + _SNIPPET_AFTER]
+    return _PROMPT_NOISE_RE.sub(lambda m: "" if m.group("url") else " ", snippet).strip()
+
+
+def _parse_batch_items(response_text: str) -> List[Any]:
+    """Extract the per-item results from a batch sentiment response.
+    
+    JSON mode returns ``{"results": [...]}`` which parses directly; a bare array,
+    possibly wrapped in prose, is still accepted from clients without JSON mode.
+    Pure and module-level so it can be handed to an executor as-is.
+    """
+    try:
+        parsed = orjson.loads(response_text)
+    except orjson.JSONDecodeError:
+        array_text = extract_json_block(response_text, "[")
+        try:
+            parsed = orjson.loads(array_text) if array_text else []
+        except orjson.JSONDecodeError:
+            return []
+    if isinstance(parsed, dict):
+        parsed = parsed.get("results", [])
+    return parsed if isinstance(parsed, list) else []
+
+
+def _response_items(response: Any) -> List[Any]:
+    """Parse the per-item results out of a batch LLM response message."""
+    return _parse_batch_items(response.content if hasattr(response, 'content') else str(response))
+
 
 class CompetitorAnalysisAgent(BaseAgent):
     """Agent for analyzing competitor mentions and sentiment in social media data."""
@@ -16,6 +111,17 @@ class CompetitorAnalysisAgent(BaseAgent):
         
         # Competitor-specific configuration
         self.competitors = Config.COMPETITORS
+        self._competitors_lower = [competitor.lower() for competitor in self.competitors]
+        # Number of (content, competitor) pairs sent to the LLM in a single prompt
+        self.sentiment_batch_size = self.get_config_value("sentiment_batch_size", 15)
+        self._competitor_pattern = self._build_competitor_pattern(tuple(self.competitors))
+        # Per-mention sentiment results are cached by (competitor, content hash): a short-lived
+        # in-process tier answers repeats without a Redis round trip, Redis backs it
+        self.sentiment_cache_ttl = self.get_config_value("cache_ttl", Config.DEFAULT_CACHE_TTL)
+        self._sentiment_memo = TTLCache(maxsize=2000, ttl=300)
+        self._sentiment_memo_lock = threading.RLock()
+        # Timestamp shared by every mention produced during one process() call
+        self._run_ts: Optional[str] = None
         
         self.logger.info(f"CompetitorAnalysisAgent initialized with {len(self.competitors)} competitors")
     
@@ -50,6 +156,7 @@ class CompetitorAnalysisAgent(BaseAgent):
             self.logger.info("Returning cached competitor analysis")
             return cached_result
         
+        self._run_ts = datetime.now().isoformat()
         try:
             # Determine processing type
             if "posts" in input_data:
@@ -73,6 +180,12 @@ class CompetitorAnalysisAgent(BaseAgent):
         except Exception as e:
             self.logger.error(f"Error in competitor analysis: {str(e)}")
             return {"error": f"Analysis failed: {str(e)}"}
+        finally:
+            self._run_ts = None
+    
+    def _timestamp(self) -> str:
+        """Timestamp for mentions: the current run's, or now when called outside process()."""
+        return self._run_ts or datetime.now().isoformat()
     
     def _create_cache_key(self, input_data: Dict[str, Any]) -> str:
         """Create cache key for competitor analysis."""
@@ -89,11 +202,21 @@ class CompetitorAnalysisAgent(BaseAgent):
     
     def _analyze_posts(self, posts: List[Dict]) -> Dict[str, Any]:
         """Analyze provided posts for competitor mentions."""
-        competitor_mentions = []
-        
+        # Collect every (content, competitor) pair first so sentiment runs as one batch
+        pairs = []
+        post_ids = []
         for i, post in enumerate(posts):
-            insights = self._extract_competitor_insights_from_post(i, post.get('text', ''))
-            competitor_mentions.extend(insights)
+            content = post.get('text', '')
+            for competitor in self._find_mentioned_competitors(content):
+                pairs.append((content, competitor))
+                post_ids.append(post.get('id', i))
+        
+        analyses = self._analyze_batch(pairs)
+        timestamp = self._timestamp()
+        competitor_mentions = [
+            self._build_mention(post_id, competitor, analysis, content, timestamp)
+            for post_id, (content, competitor), analysis in zip(post_ids, pairs, analyses)
+        ]
         
         # Generate summary
         summary = self._generate_summary_insights(competitor_mentions)
@@ -108,34 +231,37 @@ class CompetitorAnalysisAgent(BaseAgent):
     
     def _analyze_competitor(self, competitor: str, hours: int = 24) -> Dict[str, Any]:
         """Analyze mentions of a specific competitor."""
-        # Search vector database for competitor mentions
-        query_results = self.query_vector_db(competitor, k=50)
+        # Search vector database for competitor mentions; MMR picks the same number of posts
+        # from a wider candidate pool, preferring distinct mentions over near-duplicates
+        recent_results = self.rerank_mmr(
+            competitor,
+            k=self.get_config_value("mmr_k", 50),
+            fetch_k=self.get_config_value("mmr_fetch_k", 100),
+            lambda_mult=self.get_config_value("mmr_lambda", 0.5),
+            filter=recent_filter(hours),
+            text_chars=_MENTION_TEXT_CHARS
+        )
+        analyses = self._analyze_batch([(result.get("text", ""), competitor) for result in recent_results])
         
         competitor_mentions = []
-        for result in query_results:
-            # Filter by timestamp if available
-            post_time = result.get("metadata", {}).get("timestamp")
-            if self._is_recent_post(post_time, hours):
-                analysis = self._analyze_competitor_sentiment(
-                    result.get("text", ""), competitor
-                )
-                
-                mention = {
-                    "post_id": result.get("metadata", {}).get("post_id", f"doc_{len(competitor_mentions)}"),
-                    "competitor": competitor,
-                    "sentiment": analysis.get("sentiment", "neutral"),
-                    "context": result.get("text", "")[:500],
-                    "extracted_insights": analysis.get("key_points", []),
-                    "confidence": analysis.get("confidence", 0.5),
-                    "timestamp": post_time
-                }
-                
-                competitor_mentions.append(mention)
+        for result, analysis in zip(recent_results, analyses):
+            metadata = result.get("metadata", {})
+            competitor_mentions.append(self._build_mention(
+                metadata.get("post_id", f"doc_{len(competitor_mentions)}"),
+                competitor,
+                analysis,
+                result.get("text", ""),
+                metadata.get("timestamp")
+            ))
         
         # Store results in vector database
         if competitor_mentions:
             self._store_competitor_analysis(competitor_mentions)
         
+        return self._build_competitor_report(competitor, hours, competitor_mentions)
+    
+    def _build_competitor_report(self, competitor: str, hours: int, competitor_mentions: List[Dict]) -> Dict[str, Any]:
+        """Build the per-competitor analysis result from its analyzed mentions."""
         return {
             "analysis_type": "competitor_specific",
             "competitor": competitor,
@@ -148,14 +274,53 @@ class CompetitorAnalysisAgent(BaseAgent):
     
     def _generate_competitive_intelligence(self, hours: int = 24) -> Dict[str, Any]:
         """Generate comprehensive competitive intelligence report."""
-        all_mentions = []
-        competitor_summaries = {}
+        # One vector query for the whole competitor set; posts are tagged with the
+        # competitors they mention in memory and analyzed in a single batch
+        query = "Uganda fintech competitors: " + ", ".join(self.competitors)
+        query_results = self.rerank_mmr(
+            query,
+            k=self.get_config_value("max_posts", 100),
+            fetch_k=self.get_config_value("intelligence_fetch_k", 200),
+            lambda_mult=self.get_config_value("mmr_lambda", 0.5),
+            filter=recent_filter(hours)
+        )
+        
+        pairs = []
+        sources = []
+        seen_texts = set()
+        for result in query_results:
+            text = result.get("text", "")
+            # The same post stored more than once would otherwise be analyzed and counted twice
+            if text in seen_texts:
+                continue
+            seen_texts.add(text)
+            # One context string per post, shared by every mention of it
+            context = text[:500]
+            for competitor in self._find_mentioned_competitors(text):
+                pairs.append((text, competitor))
+                sources.append((result.get("metadata", {}), context))
+        
+        analyses = self._analyze_batch(pairs)
         
-        for competitor in self.competitors:
-            # Use the single competitor analysis method
-            comp_analysis = self._analyze_competitor(competitor, hours)
-            competitor_summaries[competitor] = comp_analysis
-            all_mentions.extend(comp_analysis.get("mentions", []))
+        mentions_by_competitor = {competitor: [] for competitor in self.competitors}
+        for (metadata, context), (_, competitor), analysis in zip(sources, pairs, analyses):
+            mentions = mentions_by_competitor[competitor]
+            mentions.append(self._build_mention(
+                metadata.get("post_id", f"doc_{len(mentions)}"),
+                competitor,
+                analysis,
+                context,
+                metadata.get("timestamp")
+            ))
+        
+        all_mentions = [mention for mentions in mentions_by_competitor.values() for mention in mentions]
+        if all_mentions:
+            self._store_competitor_analysis(all_mentions)
+        
+        competitor_summaries = {
+            competitor: self._build_competitor_report(competitor, hours, mentions)
+            for competitor, mentions in mentions_by_competitor.items()
+        }
         
         # Generate overall insights
         overall_summary = self._generate_summary_insights(all_mentions)
@@ -173,46 +338,244 @@ class CompetitorAnalysisAgent(BaseAgent):
     
     def _extract_competitor_insights_from_post(self, post_id: int, content: str) -> List[Dict]:
         """Extract competitor insights from a single post."""
-        insights = []
+        mentioned = self._find_mentioned_competitors(content)
+        analyses = self._analyze_batch([(content, competitor) for competitor in mentioned])
+        # Every mention shares the post's context; _build_mention's slice of an
+        # already-short string returns the same object rather than a copy
+        context = content[:500]
+        timestamp = self._timestamp()
         
-        for competitor in self.competitors:
-            if competitor.lower() in content.lower():
-                analysis = self._analyze_competitor_sentiment(content, competitor)
-                
-                insight = {
-                    "post_id": post_id,
-                    "competitor": competitor,
-                    "sentiment": analysis.get("sentiment", "neutral"),
-                    "context": content[:500],
-                    "extracted_insights": analysis.get("key_points", []),
-                    "confidence": analysis.get("confidence", 0.5),
-                    "timestamp": datetime.now().isoformat()
-                }
-                
-                insights.append(insight)
+        return [
+            self._build_mention(post_id, competitor, analysis, context, timestamp)
+            for competitor, analysis in zip(mentioned, analyses)
+        ]
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _build_competitor_pattern(competitors: Tuple[str, ...]) -> "re.Pattern":
+        """Compile one case-insensitive pattern matching every competitor name.
         
-        return insights
+        The alternation sits inside a lookahead so matches may overlap (a name that
+        appears inside another is still reported), and longer names are tried first.
+        Patterns are memoized per competitor tuple and shared by all agent instances.
+        """
+        names = sorted({competitor.lower() for competitor in competitors}, key=len, reverse=True)
+        return re.compile(f"(?=({'|'.join(map(re.escape, names))}))", re.IGNORECASE)
+    
+    def _find_mentioned_competitors(self, content: str) -> List[str]:
+        """Return the configured competitors mentioned in the content, scanning it once."""
+        if not content:
+            return []
+        hits = {match.group(1).lower() for match in self._competitor_pattern.finditer(content)}
+        if not hits:
+            return []
+        return [
+            competitor
+            for competitor, competitor_lower in zip(self.competitors, self._competitors_lower)
+            if competitor_lower in hits
+        ]
+    
+    def _build_mention(self, post_id: Any, competitor: str, analysis: Dict,
+                       content: str, timestamp: Optional[str]) -> Dict[str, Any]:
+        """Build a competitor mention record from a sentiment analysis result."""
+        return {
+            "post_id": post_id,
+            "competitor": competitor,
+            "sentiment": analysis.get("sentiment", "neutral"),
+            "context": content[:500],
+            "extracted_insights": analysis.get("key_points", []),
+            "confidence": analysis.get("confidence", 0.5),
+            "timestamp": timestamp
+        }
+    
+    def _analyze_batch(self, pairs: List[Tuple[str, str]]) -> List[Dict]:
+        """Analyze sentiment for many (content, competitor) pairs with batched LLM calls.
+        
+        Previously analyzed mentions are served from the per-mention cache in one
+        pipelined lookup. The remaining pairs are packed into numbered prompts of
+        ``sentiment_batch_size`` items and the prompts are sent concurrently, so N
+        mentions cost one round-trip instead of N. Results are returned in the same
+        order as ``pairs``; any item the LLM does not answer gets the fallback analysis.
+        """
+        if not pairs:
+            return []
+        if len(pairs) == 1:
+            return [self._analyze_competitor_sentiment(*pairs[0])]
+        
+        keys = [self._sentiment_cache_key(content, competitor) for content, competitor in pairs]
+        cached = self._get_sentiments(keys)
+        analyses = [cached.get(key) for key in keys]
+        misses = [i for i, analysis in enumerate(analyses) if analysis is None]
+        if not misses:
+            return analyses
+        
+        self.logger.info(f"Sentiment cache: {len(pairs) - len(misses)} hits, {len(misses)} misses")
+        # Identical (content, competitor) pairs share a cache key and are analyzed once
+        unique = {}
+        for i in misses:
+            unique.setdefault(keys[i], i)
+        fresh = dict(zip(unique, self._analyze_uncached([pairs[i] for i in unique.values()])))
+        to_cache = {}
+        for i in misses:
+            analysis = fresh[keys[i]]
+            if analysis is None:
+                analyses[i] = self._fallback_analysis(pairs[i][1])
+            else:
+                analyses[i] = analysis
+                to_cache[keys[i]] = analysis
+        self._put_sentiments(to_cache)
+        return analyses
+    
+    def _get_sentiments(self, keys: List[str]) -> Dict[str, Dict]:
+        """Look up cached sentiment results, in-process tier first, then one Redis pipeline."""
+        with self._sentiment_memo_lock:
+            found = {key: self._sentiment_memo[key] for key in keys if key in self._sentiment_memo}
+        remote_keys = [key for key in dict.fromkeys(keys) if key not in found]
+        if remote_keys:
+            remote = self.get_cached_results_bulk(remote_keys)
+            if remote:
+                with self._sentiment_memo_lock:
+                    self._sentiment_memo.update(remote)
+                found.update(remote)
+        return found
+    
+    def _put_sentiments(self, results: Dict[str, Dict]):
+        """Cache sentiment results in both the in-process tier and Redis."""
+        if not results:
+            return
+        with self._sentiment_memo_lock:
+            self._sentiment_memo.update(results)
+        self.cache_results_bulk(results, ttl=self.sentiment_cache_ttl)
+    
+    def _analyze_uncached(self, pairs: List[Tuple[str, str]]) -> List[Optional[Dict]]:
+        """Run batched LLM sentiment analysis; unanswered items are returned as None."""
+        chunks = list(chunk_list(pairs, self.sentiment_batch_size))
+        prompts = [self._build_batch_prompt(chunk) for chunk in chunks]
+        try:
+            # Each response is parsed as soon as it arrives, overlapping with calls still in flight
+            responses = self._invoke_all(prompts, parse=_response_items)
+        except Exception as e:
+            self.logger.error(f"Error in batched competitor sentiment analysis: {e}")
+            responses = [None] * len(chunks)
+        
+        analyses = []
+        for chunk, response in zip(chunks, responses):
+            analyses.extend(self._parse_batch_response(chunk, response))
+        return analyses
+    
+    def _sentiment_cache_key(self, content: str, competitor: str) -> str:
+        """Cache key for a single (competitor, content) sentiment result."""
+        return f"sent:{competitor}:{xxhash.xxh3_128_hexdigest(content.encode())}"
+    
+    def _invoke_all(self, prompts: List[str], parse: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+        """Send prompts to the LLM concurrently and return responses in prompt order.
+        
+        Uses the client's async API when possible. Inside a running event loop, or
+        for clients without ``ainvoke``, the IO-bound calls are overlapped on a small
+        thread pool instead. Failed calls are returned as exceptions. When ``parse`` is
+        given it is applied to each response as soon as that response arrives.
+        """
+        if len(prompts) > 1 and self._can_run_async():
+            from utils.http_clients import run_sync
+            return run_sync(self._ainvoke_all(prompts, parse))
+        
+        def invoke(prompt):
+            try:
+                response = self.llm.invoke(prompt, response_format=_JSON_MODE)
+                return parse(response) if parse else response
+            except Exception as e:
+                return e
+        
+        if len(prompts) == 1:
+            return [invoke(prompts[0])]
+        with ThreadPoolExecutor(max_workers=min(Config.LLM_MAX_CONCURRENCY, len(prompts))) as executor:
+            return list(executor.map(invoke, prompts))
+    
+    def _can_run_async(self) -> bool:
+        """Whether run_sync can drive the LLM's async API from here."""
+        if not asyncio.iscoroutinefunction(getattr(self.llm, "ainvoke", None)):
+            return False
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return True
+        return False
+    
+    async def _ainvoke_all(self, prompts: List[str], parse: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+        """Send prompts to the LLM concurrently; failed calls are returned as exceptions.
+        
+        At most ``Config.LLM_MAX_CONCURRENCY`` requests are in flight at once so large
+        batches stay within the provider's rate limits.
+        """
+        semaphore = asyncio.Semaphore(Config.LLM_MAX_CONCURRENCY)
+        
+        async def ainvoke(prompt):
+            async with semaphore:
+                response = await self.llm.ainvoke(prompt, response_format=_JSON_MODE)
+            return parse(response) if parse else response
+        
+        return await asyncio.gather(*(ainvoke(prompt) for prompt in prompts), return_exceptions=True)
+    
+    def _build_batch_prompt(self, pairs: List[Tuple[str, str]]) -> str:
+        """Build one prompt asking for sentiment on a numbered list of competitor mentions.
+        
+        Each distinct content is sent once and referenced by its items, so a post that
+        mentions several competitors costs its tokens only once.
+        """
+        competitors_by_content = {}
+        for content, competitor in pairs:
+            competitors_by_content.setdefault(content, []).append(competitor)
+        post_ids = {content: post_id for post_id, content in enumerate(competitors_by_content)}
+        
+        posts = [
+            {"post": post_id, "content": _prompt_snippet(content, competitors_by_content[content])}
+            for content, post_id in post_ids.items()
+        ]
+        items = [
+            {"id": i, "post": post_ids[content], "competitor": competitor}
+            for i, (content, competitor) in enumerate(pairs)
+        ]
+        return f"{_BATCH_PROMPT_HEADER}Posts: {orjson.dumps(posts).decode()}\n\nItems: {orjson.dumps(items).decode()}\n"
+    
+    def _parse_batch_response(self, pairs: List[Tuple[str, str]], response: Any) -> List[Optional[Dict]]:
+        """Map a batched LLM response (raw or already parsed into items) back onto its pairs.
+        
+        Items without an answer are None.
+        """
+        by_id = {}
+        if response is not None and not isinstance(response, BaseException):
+            items = response if isinstance(response, list) else _response_items(response)
+            by_id = {item.get("id"): item for item in items if isinstance(item, dict)}
+        elif isinstance(response, BaseException):
+            self.logger.error(f"Error analyzing competitor sentiment batch: {response}")
+        
+        analyses = []
+        for i in range(len(pairs)):
+            item = by_id.get(i)
+            if item and "sentiment" in item:
+                item.pop("id", None)
+                item.pop("post", None)
+                analyses.append(item)
+            else:
+                analyses.append(None)
+        return analyses
     
     def _analyze_competitor_sentiment(self, content: str, competitor: str) -> Dict:
         """Analyze sentiment for a specific competitor mention using LLM."""
+        cache_key = self._sentiment_cache_key(content, competitor)
+        with self._sentiment_memo_lock:
+            cached = self._sentiment_memo.get(cache_key)
+        if cached is None:
+            cached = self.get_cached_result(cache_key)
+        if cached:
+            return cached
+        
         try:
-            prompt = f"""
-            Analyze this social media content mentioning {competitor} in Uganda's fintech market:
-            
-            Content: {content}
-            
-            Provide analysis in JSON format:
-            {{
-                "sentiment": "positive/negative/neutral",
-                "key_points": ["insight1", "insight2"],
-                "confidence": 0.8,
-                "competitive_aspect": "pricing/features/service/brand"
-            }}
-            
-            Focus on: customer sentiment, product features, pricing, service quality, competitive positioning.
-            """
+            prompt = _SENTIMENT_PROMPT.substitute(
+                competitor=competitor, content=_prompt_snippet(content, [competitor])
+            )
             
-            response = self.llm.invoke(prompt)
+            response = self.llm.invoke(prompt, response_format=_JSON_MODE)
             
             # Extract JSON from response
             if hasattr(response, 'content'):
@@ -220,10 +583,14 @@ class CompetitorAnalysisAgent(BaseAgent):
             else:
                 response_text = str(response)
             
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            json_text = extract_json_block(response_text)
             
-            if json_match:
-                return json.loads(json_match.group())
+            if json_text:
+                analysis = orjson.loads(json_text)
+                with self._sentiment_memo_lock:
+                    self._sentiment_memo[cache_key] = analysis
+                self.cache_result(cache_key, analysis, ttl=self.sentiment_cache_ttl)
+                return analysis
             else:
                 return self._fallback_analysis(competitor)
                 
@@ -246,52 +613,48 @@ class CompetitorAnalysisAgent(BaseAgent):
             return []
         
         try:
-            # Group by competitor
-            competitor_data = {}
-            for mention in analyzed_mentions:
-                competitor = mention["competitor"]
-                if competitor not in competitor_data:
-                    competitor_data[competitor] = {
-                        "mentions": [],
-                        "sentiments": {"positive": 0, "negative": 0, "neutral": 0}
-                    }
-                competitor_data[competitor]["mentions"].append(mention)
-                sentiment = mention.get("sentiment", "neutral")
-                competitor_data[competitor]["sentiments"][sentiment] += 1
+            # Count sentiments per competitor in one crosstab, keeping first-seen competitor order
+            competitors = pd.Series([mention["competitor"] for mention in analyzed_mentions], name="competitor")
+            sentiments = pd.Series([mention.get("sentiment", "neutral") for mention in analyzed_mentions], name="sentiment")
+            order = list(dict.fromkeys(competitors))
+            counts = pd.crosstab(competitors, sentiments).reindex(
+                index=order, columns=_SENTIMENT_LABELS, fill_value=0
+            )
+            totals = competitors.value_counts().reindex(order)
+            pcts = counts.div(totals, axis=0) * 100
+            positive_pct = pcts["positive"].to_numpy()
+            negative_pct = pcts["negative"].to_numpy()
+            neutral_pct = pcts["neutral"].to_numpy()
+            
+            # Determine overall sentiment and confidence for every competitor at once;
+            # a label wins only with a strict plurality, otherwise the result is neutral
+            positive_wins = (positive_pct > negative_pct) & (positive_pct > neutral_pct)
+            negative_wins = (negative_pct > positive_pct) & (negative_pct > neutral_pct)
+            overall = np.select([positive_wins, negative_wins], ["positive", "negative"], default="neutral")
+            confidence = np.select(
+                [positive_wins, negative_wins],
+                [positive_pct, negative_pct],
+                default=np.maximum(neutral_pct, 50)
+            ) / 100
             
             # Generate insights for each competitor
-            summary_insights = []
-            for competitor, data in competitor_data.items():
-                total_mentions = len(data["mentions"])
-                positive_pct = (data["sentiments"]["positive"] / total_mentions) * 100
-                negative_pct = (data["sentiments"]["negative"] / total_mentions) * 100
-                neutral_pct = (data["sentiments"]["neutral"] / total_mentions) * 100
-                
-                # Determine overall sentiment
-                if positive_pct > negative_pct and positive_pct > neutral_pct:
-                    overall_sentiment = "positive"
-                    confidence = positive_pct / 100
-                elif negative_pct > positive_pct and negative_pct > neutral_pct:
-                    overall_sentiment = "negative"
-                    confidence = negative_pct / 100
-                else:
-                    overall_sentiment = "neutral"
-                    confidence = max(neutral_pct, 50) / 100
-                
-                summary_insights.append({
+            return [
+                {
                     "competitor": competitor,
-                    "overall_sentiment": overall_sentiment,
-                    "confidence": confidence,
-                    "total_mentions": total_mentions,
+                    "overall_sentiment": str(overall_sentiment),
+                    "confidence": float(conf),
+                    "total_mentions": int(total_mentions),
                     "sentiment_breakdown": {
-                        "positive": f"{positive_pct:.1f}%",
-                        "negative": f"{negative_pct:.1f}%",
-                        "neutral": f"{neutral_pct:.1f}%"
+                        "positive": f"{pos:.1f}%",
+                        "negative": f"{neg:.1f}%",
+                        "neutral": f"{neu:.1f}%"
                     },
                     "insight": f"{competitor}: {overall_sentiment} sentiment with {total_mentions} mentions"
-                })
-            
-            return summary_insights
+                }
+                for competitor, total_mentions, overall_sentiment, conf, pos, neg, neu in zip(
+                    order, totals.to_numpy(), overall, confidence, positive_pct, negative_pct, neutral_pct
+                )
+            ]
             
         except Exception as e:
             self.logger.error(f"Error generating summary insights: {e}")
@@ -349,37 +712,36 @@ class CompetitorAnalysisAgent(BaseAgent):
         return landscape
     
     def _store_competitor_analysis(self, competitor_mentions: List[Dict]):
-        """Store competitor analysis results in vector database."""
-        for mention in competitor_mentions:
-            try:
-                doc_id = f"competitor_{mention['competitor']}_{mention['post_id']}_{datetime.now().strftime('%Y%m%d%H%M')}"
-                
-                metadata = {
+        """Store competitor analysis results in vector database with a single batched write."""
+        if not competitor_mentions:
+            return
+
+        # One logical timestamp per batch; the index keeps ids unique within it
+        now = datetime.now()
+        timestamp = self._run_ts or now.isoformat()
+        stamp = now.strftime('%Y%m%d%H%M')
+        items = [
+            (
+                "\n".join((
+                    f"Competitor: {mention['competitor']}",
+                    f"Sentiment: {mention['sentiment']}",
+                    "Insights: " + ", ".join(map(str, mention["extracted_insights"])),
+                    f"Context: {mention['context']}"
+                )),
+                {
                     "type": "competitor_analysis",
                     "competitor": mention["competitor"],
                     "sentiment": mention["sentiment"],
                     "confidence": mention["confidence"],
-                    "timestamp": mention.get("timestamp", datetime.now().isoformat()),
+                    "timestamp": mention.get("timestamp", timestamp),
                     "agent": self.name
-                }
-                
-                content = f"Competitor: {mention['competitor']}\nSentiment: {mention['sentiment']}\nInsights: {mention['extracted_insights']}\nContext: {mention['context']}"
-                
-                self.store_in_vector_db(content, metadata, doc_id)
-                
-            except Exception as e:
-                self.logger.warning(f"Failed to store competitor mention: {str(e)}")
-    
-    def _is_recent_post(self, timestamp_str: str, hours: int) -> bool:
-        """Check if a post is within the specified time window."""
-        if not timestamp_str:
-            return True  # Include posts without timestamps
-        
+                },
+                f"competitor_{mention['competitor']}_{mention['post_id']}_{stamp}_{i}"
+            )
+            for i, mention in enumerate(competitor_mentions)
+        ]
+
         try:
-            post_time = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            current_time = datetime.now()
-            time_diff = current_time - post_time.replace(tzinfo=None)
-            return time_diff <= timedelta(hours=hours)
-        except Exception:
-            return True  # Include posts with invalid timestamps        
- 
\ No newline at end of file
+            self.store_in_vector_db(items)
+        except Exception as e:
+            self.logger.warning(f"Failed to store competitor mentions: {str(e)}")
@@ -1,13 +1,15 @@
 from langgraph.graph import StateGraph, END
 from .state import AgentState
 from database.db_manager import DatabaseManager
-from database.models import SocialMediaPost
+from config import Config
 from .competitor_agent import CompetitorAnalysisAgent
 from .market_sentiment_agent import MarketSentimentAgent
 from .coordinator import CoordinatorAgent
 from .social_intel_agent import SocialIntelAgent
+from utils.http_clients import release_loop_pool
 from utils.logger import app_logger
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, List
 
@@ -148,18 +150,25 @@ class MultiAgentWorkflow:
 
             processor = DataProcessor()
             processed_posts = []
+            done_ids = []
 
-            for raw_post in raw_posts:
-                try:
-                    result = processor.process_post(raw_post)
-                    if result:
-                        processed_posts.append(result)
-                        # Mark post as processed in database
-                        self.db_manager.mark_post_processed(raw_post.get("id"))
-                except Exception as e:
-                    app_logger.error(f"Error processing post {raw_post.get('id')}: {e}")
-                    errors = state.get("errors", []) + [f"Error processing post {raw_post.get('id')}: {e}"]
-                    state = {**state, "errors": errors}
+            # Each post waits on DB writes, the embedding call and possibly an LLM topic
+            # fallback, so posts run on a bounded thread pool; results keep input order
+            with ThreadPoolExecutor(max_workers=min(Config.LLM_MAX_CONCURRENCY, len(raw_posts))) as executor:
+                futures = [executor.submit(processor.process_post, raw_post) for raw_post in raw_posts]
+                for raw_post, future in zip(raw_posts, futures):
+                    try:
+                        result = future.result()
+                        if result:
+                            processed_posts.append(result)
+                            done_ids.append(raw_post.get("id"))
+                    except Exception as e:
+                        app_logger.error(f"Error processing post {raw_post.get('id')}: {e}")
+                        errors = state.get("errors", []) + [f"Error processing post {raw_post.get('id')}: {e}"]
+                        state = {**state, "errors": errors}
+
+            # Mark posts as processed in database
+            self.db_manager.mark_posts_processed(done_ids)
 
             self._log_step("process_posts", input_size=len(raw_posts), output_size=len(processed_posts))
             return {**state, "processed_posts": processed_posts}
@@ -177,21 +186,18 @@ class MultiAgentWorkflow:
                 app_logger.warning("No processed_posts for social intelligence analysis")
                 return {**state, "social_insights": []}
 
+            # Get full posts from database in one query
+            db_posts = self.db_manager.get_posts_by_ids(post.get("post_id") for post in processed_posts)
             for post in processed_posts:
-                # Get full post from database
-                session = self.db_manager.get_session()
-                try:
-                    db_post = session.query(SocialMediaPost).get(post.get("post_id"))
-                    if db_post:
-                        posts_for_analysis.append(
-                            {
-                                "text": db_post.cleaned_content or db_post.content,
-                                "source": db_post.source,
-                                "timestamp": db_post.timestamp.isoformat() if db_post.timestamp else datetime.now().isoformat(),
-                            }
-                        )
-                finally:
-                    session.close()
+                db_post = db_posts.get(post.get("post_id"))
+                if db_post:
+                    posts_for_analysis.append(
+                        {
+                            "text": db_post.cleaned_content or db_post.content,
+                            "source": db_post.source,
+                            "timestamp": db_post.timestamp.isoformat() if db_post.timestamp else datetime.now().isoformat(),
+                        }
+                    )
 
             # Run social intelligence analysis
             social_result = self.social_agent.process({"posts": posts_for_analysis})
@@ -213,22 +219,19 @@ class MultiAgentWorkflow:
 
             # Convert to format expected by market sentiment agent
             posts_for_analysis = []
+            db_posts = self.db_manager.get_posts_by_ids(post.get("post_id") for post in processed_posts)
             for post in processed_posts:
-                session = self.db_manager.get_session()
-                try:
-                    db_post = session.query(SocialMediaPost).get(post.get("post_id"))
-                    if db_post:
-                        posts_for_analysis.append(
-                            {
-                                "text": db_post.cleaned_content or db_post.content,
-                                "source": db_post.source,
-                                "timestamp": db_post.timestamp.isoformat() if db_post.timestamp else datetime.now().isoformat(),
-                                "sentiment": db_post.sentiment,
-                                "sentiment_score": db_post.sentiment_score,
-                            }
-                        )
-                finally:
-                    session.close()
+                db_post = db_posts.get(post.get("post_id"))
+                if db_post:
+                    posts_for_analysis.append(
+                        {
+                            "text": db_post.cleaned_content or db_post.content,
+                            "source": db_post.source,
+                            "timestamp": db_post.timestamp.isoformat() if db_post.timestamp else datetime.now().isoformat(),
+                            "sentiment": db_post.sentiment,
+                            "sentiment_score": db_post.sentiment_score,
+                        }
+                    )
 
             market_result = self.market_sentiment_agent.process({"posts": posts_for_analysis})
             market_result = market_result if isinstance(market_result, dict) else {}
@@ -256,25 +259,27 @@ class MultiAgentWorkflow:
             processed_posts = state.get("processed_posts", [])
             competitor_mentions: List[Dict[str, Any]] = []
 
+            db_posts = self.db_manager.get_posts_by_ids(post.get("post_id") for post in processed_posts)
+            posts_for_analysis = []
             for post in processed_posts:
+                db_post = db_posts.get(post.get("post_id"))
+                if db_post and (db_post.cleaned_content or db_post.content):
+                    posts_for_analysis.append({"id": post.get("post_id"), "text": db_post.cleaned_content or db_post.content})
+
+            # One process call for all posts: the agent batches every (post, competitor)
+            # pair into concurrent sentiment requests instead of one round trip per post
+            if posts_for_analysis:
+                result = self.competitor_agent.process({"posts": posts_for_analysis})
+                if result.get("error"):
+                    state = self._add_error(state, f"Error analyzing competitors: {result['error']}")
+                competitor_mentions.extend(result.get("competitor_mentions", []))
+
+            # Persist the mentions (read back by get_competitor_mentions) in one INSERT
+            if competitor_mentions:
                 try:
-                    session = self.db_manager.get_session()
-                    try:
-                        db_post = session.query(SocialMediaPost).get(post.get("post_id"))
-                        if db_post and (db_post.cleaned_content or db_post.content):
-                            text = db_post.cleaned_content or db_post.content
-                            # Use the process method with appropriate input data
-                            result = self.competitor_agent.process({
-                                "posts": [{"id": post.get("post_id"), "content": text}]
-                            })
-                            if "competitor_mentions" in result:
-                                competitor_mentions.extend(result["competitor_mentions"])
-                    finally:
-                        session.close()
-                except Exception as inner_e:
-                    app_logger.error(f"Error analyzing competitors for post {post.get('post_id')}: {inner_e}")
-                    errors = state.get("errors", []) + [f"Error analyzing competitors for post {post.get('post_id')}: {inner_e}"]
-                    state = {**state, "errors": errors}
+                    self.db_manager.add_competitor_mentions_bulk(competitor_mentions)
+                except Exception as db_e:
+                    state = self._add_error(state, f"Error storing competitor mentions: {db_e}")
 
             self._log_step("analyze_competitors", input_size=len(processed_posts), output_size=len(competitor_mentions))
             return {**state, "competitor_mentions": competitor_mentions}
@@ -302,22 +307,12 @@ class MultiAgentWorkflow:
                         )
 
             # Generate basic sentiment insights
-            positive_count = 0
-            negative_count = 0
             processed_posts = state.get("processed_posts", [])
             total = len(processed_posts)
 
-            for post in processed_posts:
-                session = self.db_manager.get_session()
-                try:
-                    db_post = session.query(SocialMediaPost).get(post.get("post_id"))
-                    if db_post and db_post.sentiment:
-                        if db_post.sentiment == "positive":
-                            positive_count += 1
-                        elif db_post.sentiment == "negative":
-                            negative_count += 1
-                finally:
-                    session.close()
+            sentiment_counts = self.db_manager.count_sentiments(post.get("post_id") for post in processed_posts)
+            positive_count = sentiment_counts.get("positive", 0)
+            negative_count = sentiment_counts.get("negative", 0)
 
             if total > 0:
                 positive_pct = (positive_count / total) * 100
@@ -340,21 +335,25 @@ class MultiAgentWorkflow:
     def compile_report(self, state: AgentState) -> AgentState:
         """Compile final intelligence report"""
         try:
-            # Use coordinator to synthesize all insights
-            synthesized = self.coordinator_agent.synthesize_insights(
+            # Coordinator pipeline: synthesis and conflict resolution run concurrently,
+            # then the daily briefing is built from the synthesis
+            coordinated = self.coordinator_agent.run_pipeline(
                 state.get("social_insights", []),
                 state.get("competitor_mentions", []),
                 state.get("market_insights", []),
                 state.get("market_analysis", {}),
+                agent_insights={
+                    "social_intelligence": state.get("social_insights", []),
+                    "market_sentiment": state.get("market_insights", []),
+                },
             )
-
-            # Generate daily briefing
-            briefing = self.coordinator_agent.generate_daily_briefing(synthesized)
+            synthesized = coordinated["synthesized_insights"]
 
             final_report = {
                 "timestamp": datetime.now().isoformat(),
                 "synthesized_insights": synthesized,
-                "daily_briefing": briefing,
+                "conflict_resolution": coordinated["conflict_resolution"],
+                "daily_briefing": coordinated["daily_briefing"],
                 "metrics": {
                     "posts_processed": len(state.get("processed_posts", [])),
                     "competitor_mentions": len(state.get("competitor_mentions", [])),
@@ -395,7 +394,18 @@ class MultiAgentWorkflow:
 
     def run(self):
         """Run the complete workflow"""
-        initial_state: AgentState = {
+        return self.workflow.invoke(self._initial_state())
+
+    async def arun(self):
+        """Run the complete workflow from async code without blocking the event loop"""
+        try:
+            return await self.workflow.ainvoke(self._initial_state())
+        finally:
+            # The caller's loop may be short-lived (asyncio.run); close its HTTP pool with it
+            await release_loop_pool()
+
+    def _initial_state(self) -> AgentState:
+        return {
             "messages": [],
             "raw_posts": [],
             "processed_posts": [],
@@ -407,6 +417,4 @@ class MultiAgentWorkflow:
             "investment_opportunities": [],
             "final_report": None,
             "errors": [],
-        }
-
-        return self.workflow.invoke(initial_state)
\ No newline at end of file
+        }
\ No newline at end of file
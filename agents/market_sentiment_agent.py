@@ -3,7 +3,10 @@ from typing import Dict, List, Any
 from datetime import datetime, timedelta
 import json
 import hashlib
+import orjson
 import re
+import time
+from collections import Counter
 from database.db_manager import DatabaseManager
 from config import Config
 
@@ -17,7 +20,11 @@ def safe_json_parse(data):
     except (json.JSONDecodeError, TypeError):
         # Return empty list as fallback
         return []
-    
+
+
+_SENT_IDX = {"positive": 0, "negative": 1, "neutral": 2}
+_NEUTRAL_IDX = _SENT_IDX["neutral"]
+
 class MarketSentimentAgent(BaseAgent):
     """Agent for analyzing overall market sentiment and trends in Uganda's fintech ecosystem."""
     
@@ -36,6 +43,8 @@ class MarketSentimentAgent(BaseAgent):
             "mobile_money", "digital_banking", "lending", "savings", 
             "investments", "cross_border", "payments", "rural_finance"
         ])
+        # Search term for each segment (underscores as spaces), derived once instead of per post
+        self._segment_terms = tuple((segment, segment.replace("_", " ")) for segment in self.market_segments)
         
         # Define risk factors to monitor
         self.risk_factors = self.config.get("risk_factors", [
@@ -139,7 +148,7 @@ class MarketSentimentAgent(BaseAgent):
     
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process market sentiment data and generate insights."""
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
         if not self.validate_input(input_data):
             return {"error": "Invalid input data"}
@@ -232,11 +241,14 @@ class MarketSentimentAgent(BaseAgent):
     
     def _analyze_market_sentiment(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze overall market sentiment from collected posts."""
+        # Tally labels in one pass; a falsy label means some post is still unlabelled
+        sentiment_counts = Counter(post.get("sentiment") for post in posts)
+        
         # If posts already have sentiment, use that
-        if all(post.get("sentiment") for post in posts):
-            positive_count = sum(1 for post in posts if post.get("sentiment") == "positive")
-            negative_count = sum(1 for post in posts if post.get("sentiment") == "negative")
-            neutral_count = sum(1 for post in posts if post.get("sentiment") == "neutral")
+        if all(sentiment_counts):
+            positive_count = sentiment_counts["positive"]
+            negative_count = sentiment_counts["negative"]
+            neutral_count = sentiment_counts["neutral"]
             
             total = len(posts)
             if total == 0:
@@ -271,7 +283,7 @@ class MarketSentimentAgent(BaseAgent):
             prompt = f"""
             Analyze the overall market sentiment in these Uganda fintech discussions:
 
-            Posts: {json.dumps([p['text'] for p in posts[:15]])}
+            Posts: {orjson.dumps([p['text'] for p in posts[:15]]).decode()}
 
             Return ONLY the analysis as a valid JSON object, 
             formatted exactly like below example, with no explanation, code, 
@@ -326,28 +338,29 @@ class MarketSentimentAgent(BaseAgent):
     def _analyze_segment_trends(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Analyze trends by market segment."""
         segment_mentions = {segment: 0 for segment in self.market_segments}
-        segment_sentiment = {segment: {"positive": 0, "negative": 0, "neutral": 0} for segment in self.market_segments}
+        # [positive, negative, neutral] counts per segment, indexed through _SENT_IDX
+        segment_sentiment = {segment: [0, 0, 0] for segment in self.market_segments}
         
         # Count mentions and sentiment by segment
         for post in posts:
             text = post.get("text", "").lower()
-            sentiment = post.get("sentiment", "neutral")
+            idx = _SENT_IDX.get(post.get("sentiment", "neutral"), _NEUTRAL_IDX)
             
-            for segment in self.market_segments:
+            for segment, segment_term in self._segment_terms:
                 # Check if segment is mentioned (using segment name with underscores replaced by spaces)
-                segment_term = segment.replace("_", " ")
                 if segment_term in text:
                     segment_mentions[segment] += 1
-                    segment_sentiment[segment][sentiment] += 1
+                    segment_sentiment[segment][idx] += 1
         
         # Calculate trends and momentum
         trends = []
         for segment, mentions in segment_mentions.items():
             if mentions > 0:
                 # Calculate sentiment distribution
-                total = sum(segment_sentiment[segment].values())
-                positive_ratio = segment_sentiment[segment]["positive"] / total if total > 0 else 0
-                negative_ratio = segment_sentiment[segment]["negative"] / total if total > 0 else 0
+                counts = segment_sentiment[segment]
+                total = counts[0] + counts[1] + counts[2]
+                positive_ratio = counts[0] / total if total > 0 else 0
+                negative_ratio = counts[1] / total if total > 0 else 0
                 
                 # Calculate sentiment score
                 sentiment_score = 0.5 + (positive_ratio - negative_ratio) / 2
@@ -386,7 +399,7 @@ class MarketSentimentAgent(BaseAgent):
         prompt = f"""
         Analyze these Uganda fintech discussions to identify 3-5 specific investment opportunities:
 
-        Posts: {json.dumps(post_texts)}
+        Posts: {orjson.dumps(post_texts).decode()}
 
         Top trending segments: {", ".join(top_segments)}
 
@@ -432,12 +445,15 @@ class MarketSentimentAgent(BaseAgent):
         """Assess market risks based on post content."""
         # Count risk factor mentions
         risk_mentions = {risk: 0 for risk in self.risk_factors}
+        # Risks found in each post, so the filter below is a set check instead of a second text scan
+        post_risks = []
         
         for post in posts:
             text = post.get("text", "").lower()
-            for risk in self.risk_factors:
-                if risk in text:
-                    risk_mentions[risk] += 1
+            found = {risk for risk in self.risk_factors if risk in text}
+            for risk in found:
+                risk_mentions[risk] += 1
+            post_risks.append(found)
         
         # Use LLM to assess risks from the most mentioned factors
         top_risks = sorted(risk_mentions.items(), key=lambda x: x[1], reverse=True)[:3]
@@ -447,11 +463,8 @@ class MarketSentimentAgent(BaseAgent):
             return []
         
         # Filter posts that mention top risks
-        risk_posts = []
-        for post in posts:
-            text = post.get("text", "").lower()
-            if any(risk in text for risk, _ in top_risks):
-                risk_posts.append(post["text"])
+        top_risk_set = set(top_risk_factors)
+        risk_posts = [post["text"] for post, found in zip(posts, post_risks) if not found.isdisjoint(top_risk_set)]
         
         if not risk_posts:
             return []
@@ -459,7 +472,7 @@ class MarketSentimentAgent(BaseAgent):
         prompt = f"""
         Analyze these Uganda fintech discussions to assess market risks:
 
-        Posts related to risks: {json.dumps(risk_posts[:15])}
+        Posts related to risks: {orjson.dumps(risk_posts[:15]).decode()}
 
         Top risk factors mentioned: {", ".join(top_risk_factors)}
 
@@ -1,17 +1,32 @@
 from .base_agent import BaseAgent
 from config import Config
+from utils.helpers import keyword_matcher
 from typing import Dict, List, Any
 import json
 import hashlib
+import orjson
 import re  
+import time
 from datetime import datetime, timedelta
 
+_JSON_DECODER = json.JSONDecoder()
+# Line formats the LLM uses when it lists insights as text instead of JSON
+_INSIGHT_PATTERNS = tuple(re.compile(pattern, re.MULTILINE) for pattern in (
+    r'INSIGHT:\s*(.+)',           # INSIGHT: format
+    r'^\d+\.\s*(.+)',            # 1. numbered format
+    r'^-\s*(.+)',                # - bullet format
+    r'^•\s*(.+)',                # • bullet format
+    r'^\*\s*(.+)'                # * bullet format
+))
+
 class SocialIntelAgent(BaseAgent):
     def __init__(self, config=None):
         super().__init__(name="social_intelligence", agent_type="social_intelligence", config=config)
         
         # Use fintech keywords from config
         self.fintech_keywords = Config.get_all_fintech_keywords()
+        # Finds every fintech keyword in a text with a single regex scan
+        self._match_keywords = keyword_matcher(tuple(sorted(self.fintech_keywords)))
         
         # Configuration from config.py - Use the new get_agent_config method
         self.cache_ttl = Config.get_agent_config("social_intelligence", "cache_ttl", Config.DEFAULT_CACHE_TTL)
@@ -47,7 +62,7 @@ class SocialIntelAgent(BaseAgent):
 
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process social intelligence with complete pipeline: fetch, anonymize, analyze, store/cache."""
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
         if not self.validate_input(input_data):
             return {'error': 'Invalid input data'}
@@ -121,7 +136,7 @@ class SocialIntelAgent(BaseAgent):
         
         for post in posts:
             text = post.get('text', '').lower()
-            if any(keyword in text for keyword in self.fintech_keywords):
+            if self._match_keywords(text):
                 post['relevance_score'] = self._calculate_relevance(text)
                 if post['relevance_score'] > 0.45: 
                     relevant_posts.append(post)
@@ -133,7 +148,7 @@ class SocialIntelAgent(BaseAgent):
         prompt = f"""
         Analyze sentiment trends in these Uganda fintech discussions:
 
-        Posts: {json.dumps([p['text'] for p in posts[:10]], ensure_ascii=False)}
+        Posts: {orjson.dumps([p['text'] for p in posts[:10]]).decode()}
 
         Return ONLY a valid JSON object with no additional text, explanations, or markdown formatting.
         Use this exact structure:
@@ -172,13 +187,9 @@ class SocialIntelAgent(BaseAgent):
             elif response_text.startswith('```'):
                 response_text = response_text.replace('```', '').strip()
             
-            # Try to find JSON in the response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group()
-            
-            # Parse JSON
-            result = json.loads(response_text)
+            # Parse the JSON object starting at the first '{' in place; trailing text is ignored
+            start = response_text.find('{')
+            result = _JSON_DECODER.raw_decode(response_text, max(start, 0))[0]
             self.logger.info("Successfully parsed sentiment analysis JSON")
             return result
             
@@ -220,9 +231,8 @@ class SocialIntelAgent(BaseAgent):
                 # Use config value for trending days
                 trending_days = self.trending_days if isinstance(self.trending_days,int) else 7
                 if (current_time - post_time).days <= trending_days:
-                    for keyword in self.fintech_keywords:
-                        if keyword in post['text'].lower():
-                            topic_counts[keyword] = topic_counts.get(keyword, 0) + 1
+                    for keyword in self._match_keywords(post['text']):
+                        topic_counts[keyword] = topic_counts.get(keyword, 0) + 1
             except (ValueError, KeyError) as e:
                 # Skip posts with invalid timestamps
                 self.logger.warning(f"Skipping post with invalid timestamp: {e}")
@@ -298,7 +308,7 @@ class SocialIntelAgent(BaseAgent):
                 max_results = self.max_posts or 10
             
             # Build fintech-focused query if not already specific
-            if not any(keyword in query.lower() for keyword in self.fintech_keywords):
+            if not self._match_keywords(query):
                 query = f"{query} fintech OR mobile money OR digital payments Uganda lang:en"
             
             self.logger.info(f"Fetching social data with query: {query}")
@@ -309,6 +319,7 @@ class SocialIntelAgent(BaseAgent):
     
     def _store_posts_in_vector_db(self, posts: List[Dict[str, Any]]):
         """Store relevant posts in vector database for future similarity searches."""
+        items = []
         for i, post in enumerate(posts):
             try:
                 doc_id = f"social_post_{datetime.now().strftime('%Y%m%d')}_{i}"
@@ -318,9 +329,11 @@ class SocialIntelAgent(BaseAgent):
                     'relevance_score': post.get('relevance_score', 0.0),
                     'agent': self.name
                 }
-                self.store_in_vector_db(post['text'], metadata, doc_id)
+                items.append((post['text'], metadata, doc_id))
             except Exception as e:
-                self.logger.warning(f"Failed to store post {i} in vector DB: {str(e)}")
+                self.logger.warning(f"Failed to prepare post {i} for vector DB: {str(e)}")
+
+        self.store_in_vector_db_bulk(items)
     
     def _generate_social_insights_with_tools(self, sentiment_analysis: Dict, 
                                            trending_topics: List[Dict], 
@@ -366,19 +379,11 @@ Focus on:
                     response_text = str(response)
                 
                 # Parse insights using multiple patterns
-                insight_patterns = [
-                    r'INSIGHT:\s*(.+)',           # INSIGHT: format
-                    r'^\d+\.\s*(.+)',            # 1. numbered format  
-                    r'^-\s*(.+)',                # - bullet format
-                    r'^•\s*(.+)',                # • bullet format
-                    r'^\*\s*(.+)'                # * bullet format
-                ]
-                
                 found_insights = []
                 
-                for pattern in insight_patterns:
+                for pattern in _INSIGHT_PATTERNS:
                     if response_text and isinstance(response_text,str):
-                        matches = re.findall(pattern, response_text, re.MULTILINE)
+                        matches = pattern.findall(response_text)
                         found_insights.extend(matches)
                 
                 # If structured parsing fails, extract sentences as insights
@@ -19,6 +19,18 @@ class Config:
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
     GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
     GROQ_TEMPERATURE = float(os.getenv("GROQ_TEMPERATURE", "0.7"))
+    # Lighter/heavier models for individual coordinator steps; both default to GROQ_MODEL.
+    # GROQ_MODEL_SMALL also serves as the fallback when a call exhausts its retries.
+    GROQ_MODEL_SMALL = os.getenv("GROQ_MODEL_SMALL", GROQ_MODEL)
+    GROQ_MODEL_SYNTH = os.getenv("GROQ_MODEL_SYNTH", GROQ_MODEL)
+    # Upper bound on LLM requests an agent keeps in flight at once (rate-limit headroom)
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    # Shared HTTP connection pool for LLM clients
+    LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "64"))
+    LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "32"))
+    LLM_HTTP_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "60"))  # seconds
+    # Seconds a coordinator LLM completion is reused for an identical prompt
+    LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "3600"))
 
     # Social Media APIs
     REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
@@ -36,6 +48,10 @@ class Config:
     # Redis Cache
     REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "128"))
+    REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "1.0"))
+    REDIS_KEEPALIVE_IDLE = int(os.getenv("REDIS_KEEPALIVE_IDLE", "60"))  # seconds
+    REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))  # seconds
 
     # ==================== VECTOR DB COLLECTIONS ====================
     DEFAULT_COLLECTION_NAME = os.getenv("DEFAULT_COLLECTION_NAME", "fintelliug_default")
@@ -50,6 +66,9 @@ class Config:
 
     # ==================== MODEL SETTINGS ====================
     AZURE_EMBEDDING_MODEL = "text-embedding-3-small"
+    # Optional shortened embedding size (text-embedding-3 models support this natively).
+    # Smaller vectors cut Chroma memory and index bandwidth; changing it requires re-indexing.
+    EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS")) if os.getenv("EMBEDDING_DIMENSIONS") else None
 
     # ==================== SHARED AGENT SETTINGS ====================
     # These apply to all agents unless overridden
@@ -101,12 +120,25 @@ class Config:
             "cache_ttl": int(os.getenv("COMPETITOR_CACHE_TTL", "7200")), 
             "max_posts": int(os.getenv("COMPETITOR_MAX_POSTS", "100")),
             "relevance_threshold": float(os.getenv("COMPETITOR_RELEVANCE_THRESHOLD", "0.35")),
-            "analysis_depth": os.getenv("COMPETITOR_ANALYSIS_DEPTH", "detailed")
+            "analysis_depth": os.getenv("COMPETITOR_ANALYSIS_DEPTH", "detailed"),
+            "sentiment_batch_size": int(os.getenv("COMPETITOR_SENTIMENT_BATCH_SIZE", "15")),
+            # MMR re-ranking of retrieved posts: fetch a wider candidate pool and keep the same
+            # number of posts as plain nearest-neighbour search, so mention counts are unchanged
+            "mmr_fetch_k": int(os.getenv("COMPETITOR_MMR_FETCH_K", "100")),
+            "mmr_k": int(os.getenv("COMPETITOR_MMR_K", "50")),
+            "mmr_lambda": float(os.getenv("COMPETITOR_MMR_LAMBDA", "0.5")),
+            "intelligence_fetch_k": int(os.getenv("COMPETITOR_INTELLIGENCE_FETCH_K", "200"))
         },
         "sentiment_analysis": {
             "cache_ttl": int(os.getenv("SENTIMENT_CACHE_TTL", "1800")),
             "max_posts": int(os.getenv("SENTIMENT_MAX_POSTS", "50")),
             "sentiment_model": os.getenv("SENTIMENT_MODEL", "vader")
+        },
+        "coordinator": {
+            # Output caps per coordinator step, sized to the JSON each step returns
+            "synthesis_max_tokens": int(os.getenv("COORDINATOR_SYNTHESIS_MAX_TOKENS", "1024")),
+            "resolution_max_tokens": int(os.getenv("COORDINATOR_RESOLUTION_MAX_TOKENS", "512")),
+            "briefing_max_tokens": int(os.getenv("COORDINATOR_BRIEFING_MAX_TOKENS", "1024"))
         }
     }
 
@@ -187,6 +219,7 @@ class Config:
 
     # Cache TTL (Time To Live) in seconds
     CACHE_TTL = int(os.getenv("CACHE_TTL", "3600"))  # 1 hour default
+    X_SEARCH_CACHE_TTL = int(os.getenv("X_SEARCH_CACHE_TTL", "300"))  # 5 minutes
 
     # Data retention (days)
     DATA_RETENTION_DAYS = int(os.getenv("DATA_RETENTION_DAYS", "90"))
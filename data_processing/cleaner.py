@@ -1,11 +1,20 @@
 import re
 import string
 from langdetect import detect, LangDetectException
+from langdetect.detector_factory import init_factory
 from config import Config
 
+_URL_RE = re.compile(r'http\S+')
+_MENTION_RE = re.compile(r'@(\w+)')
+_HASHTAG_RE = re.compile(r'#(\w+)')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s.,!?;:]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 class DataCleaner:
     def __init__(self):
         self.stopwords = set()  # Could load custom stopwords for Uganda context
+        # Load language profiles now; langdetect's lazy first-call load is not thread-safe
+        init_factory()
     
     def clean_text(self, text):
         """Clean social media text by removing noise"""
@@ -13,17 +22,17 @@ class DataCleaner:
             return ""
         
         # Remove URLs
-        text = re.sub(r'http\S+', '', text)
+        text = _URL_RE.sub('', text)
         
         # Remove mentions and hashtags but keep the text
-        text = re.sub(r'@(\w+)', r'\1', text)
-        text = re.sub(r'#(\w+)', r'\1', text)
+        text = _MENTION_RE.sub(r'\1', text)
+        text = _HASHTAG_RE.sub(r'\1', text)
         
         # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,!?;:]', '', text)
+        text = _SPECIAL_CHARS_RE.sub('', text)
         
         # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         
         return text
     
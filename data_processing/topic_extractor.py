@@ -1,13 +1,28 @@
-import openai
+import functools
 import json
 from config import Config
 from typing import List, Dict, Any
-import re
+
+_JSON_DECODER = json.JSONDecoder()
 
 class TopicExtractor:
     def __init__(self):
-        openai.api_key = Config.OPENAI_API_KEY
         self.fintech_topics = Config.FINTECH_TOPICS
+
+    @functools.cached_property
+    def llm(self):
+        """Groq chat model used for the LLM fallback, created on first use"""
+        from langchain_groq import ChatGroq
+        from utils.http_clients import get_http_clients
+        http_client, http_async_client = get_http_clients()
+        return ChatGroq(
+            model=Config.GROQ_MODEL,
+            temperature=0.1,
+            max_tokens=150,
+            groq_api_key=Config.GROQ_API_KEY,
+            http_client=http_client,
+            http_async_client=http_async_client
+        )
     
     def extract_topics_keywords(self, text):
         """Extract topics using keyword matching (fast and cheap)"""
@@ -44,18 +59,13 @@ class TopicExtractor:
             Only return the JSON object, no other text.
             """
             
-            response = openai.ChatCompletion.create(
-                model=Config.LLM_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=150,
-                temperature=0.1
-            )
+            response = self.llm.invoke(prompt)
             
-            result = response.choices[0].message.content.strip()
+            result = response.content.strip()
             # Extract JSON from response
-            json_match = re.search(r'\{.*\}', result, re.DOTALL)
-            if json_match:
-                result_data = json.loads(json_match.group())
+            start = result.find('{')
+            if start >= 0:
+                result_data = _JSON_DECODER.raw_decode(result, start)[0]
                 return result_data.get("topics", []), result_data.get("confidence", 0.5)
             else:
                 return [], 0.5
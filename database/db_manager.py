@@ -1,10 +1,12 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func, insert, update
 from sqlalchemy.orm import sessionmaker
 from .models import Base, SocialMediaPost, CompetitorMention, Insight, CompetitorSOV
 from .vector_db import ChromaDBManager
 from config import Config
+from utils.helpers import recent_filter
 import json
-from typing import Dict, List
+from datetime import datetime
+from typing import Dict, List, Optional
 
 class DatabaseManager:
     def __init__(self):
@@ -45,6 +47,34 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def get_posts_by_ids(self, post_ids) -> Dict[int, SocialMediaPost]:
+        """Load many posts in one IN query, keyed by id; missing ids are simply absent"""
+        ids = list({post_id for post_id in post_ids if post_id is not None})
+        if not ids:
+            return {}
+        session = self.get_session()
+        try:
+            posts = session.query(SocialMediaPost).filter(SocialMediaPost.id.in_(ids)).all()
+            return {post.id: post for post in posts}
+        finally:
+            session.close()
+    
+    def count_sentiments(self, post_ids) -> Dict[Optional[str], int]:
+        """Count posts per sentiment label with one GROUP BY query"""
+        ids = list({post_id for post_id in post_ids if post_id is not None})
+        if not ids:
+            return {}
+        session = self.get_session()
+        try:
+            return dict(
+                session.query(SocialMediaPost.sentiment, func.count(SocialMediaPost.id))
+                .filter(SocialMediaPost.id.in_(ids))
+                .group_by(SocialMediaPost.sentiment)
+                .all()
+            )
+        finally:
+            session.close()
+    
     def mark_post_processed(self, post_id):
         session = self.get_session()
         try:
@@ -58,6 +88,24 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def mark_posts_processed(self, post_ids) -> int:
+        """Mark many posts processed with one UPDATE ... WHERE id IN (...) and a single commit"""
+        ids = list({post_id for post_id in post_ids if post_id is not None})
+        if not ids:
+            return 0
+        session = self.get_session()
+        try:
+            result = session.execute(
+                update(SocialMediaPost).where(SocialMediaPost.id.in_(ids)).values(processed=True)
+            )
+            session.commit()
+            return result.rowcount
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
     def update_post_topics(self, post_id, topics, confidence):
         session = self.get_session()
         try:
@@ -99,6 +147,23 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def add_competitor_mentions_bulk(self, mentions: List[Dict]) -> int:
+        """Insert many competitor mentions in one executemany and a single commit"""
+        columns = CompetitorMention.__table__.columns.keys()
+        rows = [{key: value for key, value in mention.items() if key in columns} for mention in mentions]
+        if not rows:
+            return 0
+        session = self.get_session()
+        try:
+            session.execute(insert(CompetitorMention), rows)
+            session.commit()
+            return len(rows)
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
     def add_insight(self, insight_data):
         session = self.get_session()
         try:
@@ -145,9 +210,9 @@ class DatabaseManager:
         """Add a post to the vector database"""
         self.vector_db.add_documents([post_data])
     
-    def search_similar_posts(self, query: str, n_results: int = 5) -> List[Dict]:
-        """Search for similar posts in vector database"""
-        return self.vector_db.search_similar(query, n_results)
+    def search_similar_posts(self, query: str, n_results: int = 5, hours: Optional[int] = None) -> List[Dict]:
+        """Search for similar posts in vector database, optionally only from the last `hours` hours"""
+        return self.vector_db.search_similar(query, n_results, recent_filter(hours))
     
     def search_posts_by_topic(self, topic: str, n_results: int = 10) -> List[Dict]:
         """Search posts by topic"""
@@ -181,15 +246,22 @@ class DatabaseManager:
 
     # Competitor SOV helpers
     def save_competitor_sov(self, competitor_to_mentions: Dict[str, int], period_hours: int) -> None:
+        if not competitor_to_mentions:
+            return
+        # One timestamp for the whole batch so get_latest_top_competitor sees it as one snapshot
+        calculated_at = datetime.utcnow()
+        rows = [
+            {
+                "competitor": competitor,
+                "mentions": int(mentions),
+                "period_hours": period_hours,
+                "calculated_at": calculated_at
+            }
+            for competitor, mentions in competitor_to_mentions.items()
+        ]
         session = self.get_session()
         try:
-            for competitor, mentions in competitor_to_mentions.items():
-                record = CompetitorSOV(
-                    competitor=competitor,
-                    mentions=int(mentions),
-                    period_hours=period_hours
-                )
-                session.add(record)
+            session.execute(insert(CompetitorSOV), rows)
             session.commit()
         except Exception as e:
             session.rollback()
@@ -1,5 +1,4 @@
 from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, JSON, Boolean
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, declarative_base
 from datetime import datetime
 import json
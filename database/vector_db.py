@@ -8,6 +8,8 @@ import os
 import time
 
 from config import Config
+from utils.helpers import ts_epoch
+from utils.http_clients import get_http_clients
 from utils.logger import app_logger
 
 
@@ -64,7 +66,14 @@ class ChromaDBManager:
             azure_endpoint = getattr(Config, "AZURE_EMBEDDING_ENDPOINT", None) or os.getenv("AZURE_EMBEDDING_ENDPOINT")
             if not azure_endpoint:
                 raise RuntimeError("Azure endpoint not configured. Set AZURE_EMBEDDING_ENDPOINT in your config or environment.")
-            self.embedder = AzureOpenAIEmbeddings(model=model_name, azure_endpoint=azure_endpoint)
+            http_client, http_async_client = get_http_clients()
+            self.embedder = AzureOpenAIEmbeddings(
+                model=model_name,
+                azure_endpoint=azure_endpoint,
+                dimensions=Config.EMBEDDING_DIMENSIONS,
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
             app_logger.info(f"Initialized Azure embeddings with model: {model_name} and endpoint: {azure_endpoint}")
         except Exception as e:
             app_logger.error(f"Failed to initialize Azure embeddings: {e}")
@@ -99,7 +108,7 @@ class ChromaDBManager:
                 app_logger.error(f"Azure embedding call failed: {e}")
 
         # Fallback: return dummy zero embeddings with common dim (384)
-        dim = getattr(Config, "EMBEDDING_DIM", 384)
+        dim = Config.EMBEDDING_DIMENSIONS or getattr(Config, "EMBEDDING_DIM", 384)
         app_logger.warning("Returning dummy embeddings; configure Config.AZURE_EMBEDDING_MODEL and Azure creds.")
         return [[0.0] * dim for _ in texts]
 
@@ -124,6 +133,11 @@ class ChromaDBManager:
                 }
                 for doc in documents
             ]
+            # Numeric copy of the timestamp so recency filters run inside Chroma
+            for doc, metadata in zip(documents, metadatas):
+                epoch = ts_epoch(doc.get("timestamp"))
+                if epoch is not None:
+                    metadata["ts_epoch"] = epoch
 
             # Generate embeddings
             embeddings = self.generate_embeddings(texts)
@@ -148,27 +162,30 @@ class ChromaDBManager:
 
         try:
             # Generate query embedding
-            query_embedding = self.generate_embeddings([query])[0]
+            query_embeddings = self.generate_embeddings([query])
 
             # Perform search
             results = self.collection.query(
-                query_embeddings=[query_embedding], n_results=n_results, where=filters
+                query_embeddings=query_embeddings, n_results=n_results, where=filters
             )
 
             # Format results
-            formatted_results = []
-            if results and "ids" in results and results["ids"]:
-                for i in range(len(results["ids"][0])):
-                    formatted_results.append(
-                        {
-                            "id": results["ids"][0][i],
-                            "content": results["documents"][0][i],
-                            "metadata": results["metadatas"][0][i],
-                            "distance": results["distances"][0][i],
-                        }
-                    )
-
-            return formatted_results
+            if not results or not results.get("ids"):
+                return []
+            return [
+                {
+                    "id": doc_id,
+                    "content": document,
+                    "metadata": metadata,
+                    "distance": distance,
+                }
+                for doc_id, document, metadata, distance in zip(
+                    results["ids"][0],
+                    results["documents"][0],
+                    results["metadatas"][0],
+                    results["distances"][0],
+                )
+            ]
 
         except Exception as e:
             app_logger.error(f"Error searching ChromaDB: {e}")
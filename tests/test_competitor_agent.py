@@ -1,7 +1,8 @@
 import pytest
 import sys
 import os
-from unittest.mock import Mock, patch, MagicMock
+import time
+from unittest.mock import Mock, patch, MagicMock, ANY
 from datetime import datetime, timedelta
 import json
 
@@ -28,10 +29,10 @@ class TestCompetitorAnalysisAgent:
         self.env_patcher.start()
         
         # Mock all the dependencies
-        self.groq_patcher = patch('agents.base_agent.ChatGroq')
-        self.embeddings_patcher = patch('agents.base_agent.AzureOpenAIEmbeddings')
-        self.chroma_patcher = patch('agents.base_agent.Chroma')
-        self.redis_patcher = patch('agents.base_agent.redis.Redis')
+        self.groq_patcher = patch('langchain_groq.ChatGroq')
+        self.embeddings_patcher = patch('langchain_openai.AzureOpenAIEmbeddings')
+        self.chroma_patcher = patch('database.vector_db.ChromaDBManager')
+        self.redis_patcher = patch('redis.Redis')
         self.xsearch_patcher = patch('agents.base_agent.XSearchTool')
         
         # Start all patchers
@@ -67,10 +68,10 @@ class TestCompetitorAnalysisAgent:
             'AZURE_EMBEDDING_ENDPOINT': 'test_endpoint',
             'AZURE_EMBEDDING_BASE': 'test_base'
         }):
-            with patch('agents.base_agent.ChatGroq'), \
-                 patch('agents.base_agent.AzureOpenAIEmbeddings'), \
-                 patch('agents.base_agent.Chroma'), \
-                 patch('agents.base_agent.redis.Redis'), \
+            with patch('langchain_groq.ChatGroq'), \
+                 patch('langchain_openai.AzureOpenAIEmbeddings'), \
+                 patch('database.vector_db.ChromaDBManager'), \
+                 patch('redis.Redis'), \
                  patch('agents.base_agent.XSearchTool'):
                 
                 agent = CompetitorAnalysisAgent()
@@ -93,10 +94,10 @@ class TestCompetitorAnalysisAgent:
             'AZURE_EMBEDDING_ENDPOINT': 'test_endpoint',
             'AZURE_EMBEDDING_BASE': 'test_base'
         }):
-            with patch('agents.base_agent.ChatGroq'), \
-                 patch('agents.base_agent.AzureOpenAIEmbeddings'), \
-                 patch('agents.base_agent.Chroma'), \
-                 patch('agents.base_agent.redis.Redis'), \
+            with patch('langchain_groq.ChatGroq'), \
+                 patch('langchain_openai.AzureOpenAIEmbeddings'), \
+                 patch('database.vector_db.ChromaDBManager'), \
+                 patch('redis.Redis'), \
                  patch('agents.base_agent.XSearchTool'):
                 
                 agent = CompetitorAnalysisAgent(custom_config)
@@ -104,6 +105,12 @@ class TestCompetitorAnalysisAgent:
                 assert len(agent.competitors) == 2
                 assert "Custom Bank" in agent.competitors
     
+    def test_init_reads_environment_at_construction(self):
+        """Test that env changes after the first agent was built are still seen."""
+        with patch.dict(os.environ, {'GROQ_API_KEY': ''}):
+            with pytest.raises(ValueError, match="GROQ_API_KEY"):
+                CompetitorAnalysisAgent()
+
     def test_validate_input_valid_query(self):
         """Test input validation with valid query data."""
         input_data = {"query": "MTN MoMo"}
@@ -168,10 +175,11 @@ class TestCompetitorAnalysisAgent:
             {"text": "Airtel Money has better rates"}
         ]
         
-        # Mock the competitor insights extraction
-        self.agent._extract_competitor_insights_from_post = Mock(side_effect=[
-            [{"competitor": "MTN MoMo", "sentiment": "positive"}],
-            [{"competitor": "Airtel Money", "sentiment": "positive"}]
+        # Mock competitor detection and the batched sentiment analysis
+        self.agent._find_mentioned_competitors = Mock(side_effect=[["MTN MoMo"], ["Airtel Money"]])
+        self.agent._analyze_batch = Mock(return_value=[
+            {"sentiment": "positive", "key_points": [], "confidence": 0.8},
+            {"sentiment": "positive", "key_points": [], "confidence": 0.7}
         ])
         
         # Mock summary generation
@@ -186,7 +194,179 @@ class TestCompetitorAnalysisAgent:
         assert len(result["competitor_mentions"]) == 2
         assert "summary" in result
         assert "timestamp" in result
+        
+        # All pairs from all posts go to a single batched call
+        self.agent._analyze_batch.assert_called_once_with([
+            ("MTN MoMo is great for payments", "MTN MoMo"),
+            ("Airtel Money has better rates", "Airtel Money")
+        ])
+    
+    def test_analyze_batch_uses_sentiment_cache(self):
+        """Test that cached mentions skip the LLM and only misses are analyzed."""
+        pairs = [("MTN MoMo is fast", "MTN MoMo"), ("Airtel Money is down again", "Airtel Money")]
+        cached_analysis = {"sentiment": "positive", "key_points": ["fast"], "confidence": 0.9}
+        fresh_analysis = {"sentiment": "negative", "key_points": ["outage"], "confidence": 0.8}
+        hit_key = self.agent._sentiment_cache_key(*pairs[0])
+        
+        self.agent.get_cached_results_bulk = Mock(return_value={hit_key: cached_analysis})
+        self.agent.cache_results_bulk = Mock()
+        self.agent._analyze_uncached = Mock(return_value=[fresh_analysis])
+        
+        results = self.agent._analyze_batch(pairs)
+        
+        assert results == [cached_analysis, fresh_analysis]
+        self.agent._analyze_uncached.assert_called_once_with([pairs[1]])
+        cached_items = self.agent.cache_results_bulk.call_args[0][0]
+        assert list(cached_items.values()) == [fresh_analysis]
     
+    def test_analyze_batch_dedupes_identical_pairs(self):
+        """Test that repeated (content, competitor) pairs reach the LLM only once."""
+        pair = ("MTN MoMo is fast", "MTN MoMo")
+        other = ("MTN MoMo is fast", "Airtel Money")
+        analysis = {"sentiment": "positive", "key_points": ["fast"], "confidence": 0.9}
+        
+        self.agent.get_cached_results_bulk = Mock(return_value={})
+        self.agent.cache_results_bulk = Mock()
+        self.agent._analyze_uncached = Mock(return_value=[analysis, None])
+        
+        results = self.agent._analyze_batch([pair, other, pair])
+        
+        self.agent._analyze_uncached.assert_called_once_with([pair, other])
+        assert results[0] == results[2] == analysis
+        assert results[1]["confidence"] == 0.3
+    
+    def test_build_batch_prompt_sends_shared_content_once(self):
+        """Test that a post mentioning several competitors is inlined once."""
+        content = "MTN MoMo and Airtel Money both raised fees"
+        prompt = self.agent._build_batch_prompt([(content, "MTN MoMo"), (content, "Airtel Money")])
+        
+        assert prompt.count(content) == 1
+        assert '"post":0,"competitor":"Airtel Money"' in prompt
+    
+    def test_parse_batch_response(self):
+        """Test mapping a batched LLM response back onto its pairs."""
+        pairs = [("MTN MoMo is fast", "MTN MoMo"), ("Airtel Money is down again", "Airtel Money")]
+        
+        mock_response = Mock()
+        mock_response.content = '''
+        [
+            {"id": 1, "sentiment": "negative", "key_points": ["outage"], "confidence": 0.9, "competitive_aspect": "service"}
+        ]
+        '''
+        
+        results = self.agent._parse_batch_response(pairs, mock_response)
+        
+        assert len(results) == 2
+        # Item 0 was not answered, so the caller falls back for it
+        assert results[0] is None
+        assert results[1]["sentiment"] == "negative"
+        assert "id" not in results[1]
+    
+    def test_parse_batch_response_json_mode(self):
+        """Test parsing the {"results": [...]} object returned in JSON mode."""
+        pairs = [("MTN MoMo is fast", "MTN MoMo"), ("Airtel Money is down again", "Airtel Money")]
+        
+        mock_response = Mock()
+        mock_response.content = '{"results": [{"id": 0, "sentiment": "positive", "key_points": ["fast"], "confidence": 0.8}]}'
+        
+        results = self.agent._parse_batch_response(pairs, mock_response)
+        
+        assert results[0]["sentiment"] == "positive"
+        assert results[1] is None
+
+    def test_invoke_all_twice_reuses_one_pool(self):
+        """Test that back-to-back sync batches share one live connection pool."""
+        import httpx
+        from utils.http_clients import PerLoopAsyncClient
+
+        client = PerLoopAsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, text='{"results": []}')
+        ))
+        loop_clients = []
+
+        class HttpLLM:
+            async def ainvoke(self, prompt, **kwargs):
+                loop_clients.append(client._loop_client())
+                response = await client.post("https://llm.test/chat", content=prompt)
+                return Mock(content=response.text)
+
+        self.agent.llm = HttpLLM()
+        first = self.agent._invoke_all(["a", "b"])
+        second = self.agent._invoke_all(["c", "d"])
+
+        for response in first + second:
+            assert not isinstance(response, Exception)
+            assert response.content == '{"results": []}'
+        # Every batch runs on the run_sync loop, so all requests go through the same pool
+        assert all(pool is loop_clients[0] for pool in loop_clients)
+        assert not loop_clients[0].is_closed
+
+    def test_store_in_vector_db_bulk_twice_embeds_on_each_loop(self):
+        """Test that the async embedder works across consecutive sync calls."""
+        import httpx
+        from utils.http_clients import PerLoopAsyncClient
+
+        client = PerLoopAsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"data": [[0.1, 0.2]]})
+        ))
+
+        class HttpEmbeddings:
+            async def aembed_documents(self, texts):
+                response = await client.post("https://embeddings.test/embed", json=texts)
+                return [response.json()["data"][0] for _ in texts]
+
+        collection = Mock()
+        self.agent.embeddings = HttpEmbeddings()
+        self.agent._vector_collection = Mock(return_value=collection)
+
+        self.agent.store_in_vector_db_bulk([("MTN MoMo is fast", {"source": "x"}, "doc_1")])
+        self.agent.store_in_vector_db_bulk([("Airtel Money is down", {"source": "x"}, "doc_2")])
+
+        assert collection.upsert.call_count == 2
+        assert collection.upsert.call_args.kwargs["embeddings"] == [[0.1, 0.2]]
+        self.agent.logger.error.assert_not_called()
+
+    def test_delete_old_records_does_not_scan_collection(self):
+        """Test that a normal retention sweep deletes by predicate without paging through records."""
+        collection = Mock()
+        self.agent._vector_collection = Mock(return_value=collection)
+
+        assert self.agent.delete_old_records(cutoff_days=90) is True
+
+        collection.get.assert_not_called()
+        collection.update.assert_not_called()
+        collection.delete.assert_called_once()
+        assert "$lt" in collection.delete.call_args.kwargs["where"]["ts_epoch"]
+
+    def test_delete_old_records_backfills_legacy_timestamps(self):
+        """Test that an opt-in backfill dates records stored without ts_epoch before the delete."""
+        old = (datetime.now() - timedelta(days=200)).isoformat()
+        collection = Mock()
+        collection.get.side_effect = [
+            {
+                "ids": ["legacy", "current", "undated"],
+                "metadatas": [
+                    {"timestamp": old, "source": "x"},
+                    {"timestamp": old, "ts_epoch": 1.0},
+                    {"source": "x"},
+                ],
+            },
+            {"ids": [], "metadatas": []},
+        ]
+        self.agent._vector_collection = Mock(return_value=collection)
+
+        assert self.agent.delete_old_records(cutoff_days=90, backfill=True) is True
+
+        collection.update.assert_called_once()
+        update = collection.update.call_args.kwargs
+        assert update["ids"] == ["legacy"]
+        assert update["metadatas"][0]["source"] == "x"
+        assert update["metadatas"][0]["ts_epoch"] == pytest.approx(datetime.fromisoformat(old).timestamp())
+        # Backfill runs before the delete so legacy records match its ts_epoch predicate
+        calls = [c[0] for c in collection.method_calls]
+        assert calls.index("update") < calls.index("delete")
+        self.agent.logger.warning.assert_called_once()
+
     def test_extract_competitor_insights_from_post(self):
         """Test competitor insights extraction from single post."""
         content = "I love using MTN MoMo for mobile payments. It's very reliable."
@@ -479,8 +659,7 @@ class TestCompetitorAnalysisAgent:
             }
         ]
         
-        self.agent.query_vector_db = Mock(return_value=mock_results)
-        self.agent._is_recent_post = Mock(return_value=True)
+        self.agent.rerank_mmr = Mock(return_value=mock_results)
         self.agent._analyze_competitor_sentiment = Mock(return_value={
             "sentiment": "positive",
             "key_points": ["excellent service"],
@@ -499,17 +678,30 @@ class TestCompetitorAnalysisAgent:
         assert result["time_period_hours"] == hours
         assert result["total_mentions"] == 1
         
-        self.agent.query_vector_db.assert_called_once_with(competitor, k=50)
+        # Recency is pushed down to the vector store as a ts_epoch predicate
+        # Candidates are MMR re-ranked: fetch_k nearest fetched, the baseline 50 kept
+        self.agent.rerank_mmr.assert_called_once_with(
+            competitor, k=50, fetch_k=100, lambda_mult=0.5, filter=ANY, text_chars=2048
+        )
+        cutoff = self.agent.rerank_mmr.call_args.kwargs["filter"]["ts_epoch"]["$gte"]
+        assert cutoff == pytest.approx(time.time() - hours * 3600, abs=60)
         self.agent._store_competitor_analysis.assert_called_once()
     
     def test_generate_competitive_intelligence(self):
         """Test comprehensive competitive intelligence generation."""
-        # Mock the _analyze_competitor method for each competitor
-        self.agent._analyze_competitor = Mock(return_value={
-            "mentions": [{"competitor": "MTN MoMo", "sentiment": "positive"}],
-            "total_mentions": 1
-        })
+        mtn, airtel = self.agent.competitors[0], self.agent.competitors[1]
+        mock_results = [
+            {"text": f"{mtn} is reliable", "metadata": {"post_id": "post_1"}, "score": 0.2},
+            {"text": f"{airtel} and {mtn} both raised fees", "metadata": {"post_id": "post_2"}, "score": 0.3},
+            {"text": "Nothing about providers here", "metadata": {"post_id": "post_3"}, "score": 0.9}
+        ]
         
+        # A single vector-DB query serves every competitor
+        self.agent.rerank_mmr = Mock(return_value=mock_results)
+        self.agent._analyze_batch = Mock(side_effect=lambda pairs: [
+            {"sentiment": "positive", "key_points": [], "confidence": 0.8} for _ in pairs
+        ])
+        self.agent._store_competitor_analysis = Mock()
         self.agent._generate_summary_insights = Mock(return_value=[])
         self.agent._generate_competitive_landscape = Mock(return_value={})
         
@@ -521,13 +713,22 @@ class TestCompetitorAnalysisAgent:
         assert result["analysis_type"] == "comprehensive"
         assert result["time_period_hours"] == 48
         assert result["competitors_analyzed"] == len(self.agent.competitors)
+        assert result["total_mentions"] == 3
         assert "competitor_summaries" in result
         assert "overall_summary" in result
         assert "competitive_landscape" in result
         
-        # Should call _analyze_competitor for each competitor
-        assert self.agent._analyze_competitor.call_count == len(self.agent.competitors)
-
+        summaries = result["competitor_summaries"]
+        assert set(summaries) == set(self.agent.competitors)
+        assert summaries[mtn]["total_mentions"] == 2
+        assert summaries[airtel]["total_mentions"] == 1
+        
+        self.agent.rerank_mmr.assert_called_once()
+        # Re-ranking keeps max_posts results, as the plain query did; only the pool is wider
+        assert self.agent.rerank_mmr.call_args.kwargs["k"] == 100
+        assert self.agent.rerank_mmr.call_args.kwargs["fetch_k"] == 200
+        self.agent._analyze_batch.assert_called_once()
+        self.agent._store_competitor_analysis.assert_called_once()
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,176 @@
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.coordinator import CoordinatorAgent
+
+
+class TestCoordinatorAgent:
+    """Unit tests for CoordinatorAgent paths that do not need a live LLM."""
+
+    def setup_method(self):
+        """Build a coordinator with its external clients mocked out."""
+        self.env_patcher = patch.dict(os.environ, {
+            'GROQ_API_KEY': 'test_key',
+            'AZURE_OPENAI_API_KEY': 'test_key',
+            'AZURE_EMBEDDING_ENDPOINT': 'test_endpoint',
+            'AZURE_EMBEDDING_BASE': 'test_base'
+        })
+        self.db_patcher = patch('agents.coordinator.DatabaseManager')
+        self.xsearch_patcher = patch('agents.base_agent.XSearchTool')
+        self.env_patcher.start()
+        self.mock_db_cls = self.db_patcher.start()
+        self.xsearch_patcher.start()
+
+        self.agent = CoordinatorAgent()
+        self.agent.llm = Mock()
+        self.agent.redis_client = Mock()
+
+    def teardown_method(self):
+        self.agent.close()
+        self.env_patcher.stop()
+        self.db_patcher.stop()
+        self.xsearch_patcher.stop()
+
+    def test_fallback_insights_are_independent_copies(self):
+        """Mutating one fallback result must not leak into the next one."""
+        first = self.agent._generate_fallback_insights([], [], [])
+        first["investment_opportunities"][0]["potential"] = "Changed"
+        first["key_trends"].append("extra trend")
+
+        second = self.agent._generate_fallback_insights([], [], [])
+        assert second["investment_opportunities"][0]["potential"] == "High"
+        assert len(second["key_trends"]) == 3
+        assert isinstance(second["risks"], list)
+
+    def test_fallback_briefing_is_an_independent_copy(self):
+        first = self.agent._generate_fallback_briefing({})
+        first["sections"][0]["content"] = "Changed"
+        first["key_takeaways"].append("extra")
+
+        second = self.agent._generate_fallback_briefing({})
+        assert second["sections"][0]["content"] != "Changed"
+        assert len(second["key_takeaways"]) == 3
+        assert second["title"].startswith("Uganda Fintech Daily Briefing - ")
+
+    def _mock_llm_resolution(self):
+        self.agent.call_llm_with_retry = Mock(return_value='{"resolved": true, "resolution": "llm"}')
+
+    def test_resolve_conflicts_weighted_winner(self):
+        """Summed confidence decides the winner without an LLM call."""
+        self._mock_llm_resolution()
+        agent_insights = {
+            "social_intelligence": [{"topic": "fees", "sentiment": "negative", "confidence": 0.9}],
+            "market_sentiment": [
+                {"topic": "fees", "sentiment": "positive", "confidence": 0.4},
+                {"topic": "fees", "sentiment": "positive", "confidence": 0.3},
+            ],
+        }
+
+        result = self.agent.resolve_conflicts(agent_insights)
+
+        self.agent.call_llm_with_retry.assert_not_called()
+        assert result["resolved"] is True
+        resolution = result["resolutions"][0]
+        assert resolution["topic"] == "fees"
+        assert resolution["winner"] == "negative"
+        assert resolution["margin"] == pytest.approx(0.2)
+        assert resolution["weights"] == {"negative": 0.9, "positive": 0.7}
+
+    def test_resolve_conflicts_missing_confidence_counts_as_half(self):
+        self._mock_llm_resolution()
+        agent_insights = {
+            "social_intelligence": [{"topic": "fees", "sentiment": "negative"}],
+            "market_sentiment": [{"topic": "fees", "sentiment": "positive", "confidence": 0.4}],
+        }
+
+        result = self.agent.resolve_conflicts(agent_insights)
+
+        self.agent.call_llm_with_retry.assert_not_called()
+        resolution = result["resolutions"][0]
+        assert resolution["winner"] == "negative"
+        assert resolution["weights"] == {"negative": 0.5, "positive": 0.4}
+
+    def test_resolve_conflicts_tie_goes_to_llm(self):
+        """An even vote has no weighted winner, so the LLM arbitrates."""
+        self._mock_llm_resolution()
+        agent_insights = {
+            "social_intelligence": [{"topic": "fees", "sentiment": "negative"}],
+            "market_sentiment": [{"topic": "fees", "sentiment": "positive", "confidence": 0.5}],
+        }
+
+        result = self.agent.resolve_conflicts(agent_insights)
+
+        self.agent.call_llm_with_retry.assert_called_once()
+        assert result["resolution"] == "llm"
+
+    def test_resolve_conflicts_mixed_types_go_to_llm(self):
+        """Any non-sentiment conflict sends the whole set to the LLM."""
+        self._mock_llm_resolution()
+        conflicts = [
+            {"topic": "fees", "type": "sentiment_conflict", "evidence": {"negative": ["a"], "positive": ["b"]}},
+            {"topic": "adoption", "type": "metric_conflict", "evidence": {"a": 0.2, "b": 0.8}},
+        ]
+        self.agent._identify_conflicts = Mock(return_value=conflicts)
+
+        result = self.agent.resolve_conflicts({"social_intelligence": []})
+
+        self.agent.call_llm_with_retry.assert_called_once()
+        assert result["resolution"] == "llm"
+
+    def test_generate_daily_briefing_is_persisted_after_close(self):
+        """The background write lands in the database once the writer is drained."""
+        self.agent.call_llm_with_retry = Mock(return_value='{"title": "Briefing", "confidence": 0.9}')
+
+        briefing = self.agent.generate_daily_briefing({"key_trends": ["mobile money growth"]})
+        self.agent.close()
+
+        assert briefing == {"title": "Briefing", "confidence": 0.9}
+        self.agent.db_manager.add_insight.assert_called_once()
+        stored = self.agent.db_manager.add_insight.call_args.args[0]
+        assert stored["type"] == "daily_briefing"
+        assert stored["confidence"] == 0.9
+
+    def test_flush_briefings_waits_for_pending_write(self):
+        self.agent.call_llm_with_retry = Mock(return_value='{"title": "Briefing"}')
+
+        self.agent.generate_daily_briefing({"key_trends": ["agent banking"]})
+        self.agent.flush_briefings(timeout=5)
+
+        self.agent.db_manager.add_insight.assert_called_once()
+
+    def test_llm_cache_key_covers_system_model_temperature_and_max_tokens(self):
+        llm = Mock(model_name="llama", temperature=0.1, max_tokens=512)
+        key = self.agent._llm_cache_key("prompt", "system", None, llm)
+
+        assert key == self.agent._llm_cache_key("prompt", "system", None, llm)
+        assert key != self.agent._llm_cache_key("prompt", "other system", None, llm)
+        assert key != self.agent._llm_cache_key("prompt", "system", 1024, llm)
+        assert key != self.agent._llm_cache_key("prompt", "system", None,
+                                                Mock(model_name="mixtral", temperature=0.1, max_tokens=512))
+        assert key != self.agent._llm_cache_key("prompt", "system", None,
+                                                Mock(model_name="llama", temperature=0.7, max_tokens=512))
+
+    def test_call_llm_with_retry_does_not_cache_non_json_replies(self):
+        self.agent.llm_cache = Mock()
+        self.agent.llm_cache.get.return_value = None
+        self.agent._invoke_llm = Mock(return_value="Sorry, I cannot help with that.")
+
+        assert self.agent.call_llm_with_retry("prompt") == "Sorry, I cannot help with that."
+        self.agent.llm_cache.set.assert_not_called()
+
+        self.agent._invoke_llm.return_value = 'Here you go: {"ok": true}'
+        self.agent.call_llm_with_retry("prompt")
+        self.agent.llm_cache.set.assert_called_once()
+
+    def test_call_llm_with_retry_serves_cache_hits_without_invoking(self):
+        self.agent.llm_cache = Mock()
+        self.agent.llm_cache.get.return_value = '{"cached": true}'
+        self.agent._invoke_llm = Mock()
+
+        assert self.agent.call_llm_with_retry("prompt") == '{"cached": true}'
+        self.agent._invoke_llm.assert_not_called()
@@ -0,0 +1,51 @@
+import pytest
+import sys
+import os
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.db_manager import DatabaseManager
+
+
+class TestDatabaseManagerBulk:
+    """Unit tests for the bulk write helpers, run against a mocked session."""
+
+    def setup_method(self):
+        # Skip __init__ so no engine or Chroma client is created
+        self.db_manager = DatabaseManager.__new__(DatabaseManager)
+        self.session = Mock()
+        self.db_manager.get_session = Mock(return_value=self.session)
+
+    def test_add_competitor_mentions_bulk_filters_columns_and_commits_once(self):
+        mentions = [
+            {"post_id": 1, "competitor": "MTN MoMo", "sentiment": "positive", "context": "fast",
+             "extracted_insights": ["fast"], "confidence": 0.8, "timestamp": "2024-01-01T00:00:00"},
+            {"post_id": 2, "competitor": "Airtel Money", "sentiment": "negative", "context": "down",
+             "extracted_insights": [], "confidence": 0.6, "unknown_field": "dropped"},
+        ]
+
+        assert self.db_manager.add_competitor_mentions_bulk(mentions) == 2
+
+        self.session.execute.assert_called_once()
+        rows = self.session.execute.call_args.args[1]
+        # Keys that are not table columns are dropped before the INSERT
+        assert all("timestamp" not in row and "unknown_field" not in row for row in rows)
+        assert rows[0] == {"post_id": 1, "competitor": "MTN MoMo", "sentiment": "positive", "context": "fast",
+                           "extracted_insights": ["fast"], "confidence": 0.8}
+        self.session.commit.assert_called_once()
+        self.session.close.assert_called_once()
+
+    def test_add_competitor_mentions_bulk_empty_skips_session(self):
+        assert self.db_manager.add_competitor_mentions_bulk([]) == 0
+        self.db_manager.get_session.assert_not_called()
+
+    def test_add_competitor_mentions_bulk_rolls_back_on_error(self):
+        self.session.execute.side_effect = RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            self.db_manager.add_competitor_mentions_bulk([{"competitor": "MTN MoMo"}])
+
+        self.session.rollback.assert_called_once()
+        self.session.commit.assert_not_called()
+        self.session.close.assert_called_once()
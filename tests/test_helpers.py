@@ -0,0 +1,119 @@
+import json
+import sys
+import os
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.helpers import extract_json_block, keyword_matcher, recent_filter, ts_epoch, with_ts_epoch
+
+
+class TestExtractJsonBlock:
+    """Unit tests for the single-pass JSON block scanner used on LLM replies."""
+
+    def test_plain_object(self):
+        assert extract_json_block('{"a": 1}') == '{"a": 1}'
+
+    def test_leading_and_trailing_prose(self):
+        text = 'Here is the analysis:\n{"sentiment": "positive"}\nLet me know if you need more.'
+        assert extract_json_block(text) == '{"sentiment": "positive"}'
+
+    def test_nested_objects(self):
+        text = 'Result: {"a": {"b": {"c": 1}}, "d": [1, 2]} done'
+        assert json.loads(extract_json_block(text)) == {"a": {"b": {"c": 1}}, "d": [1, 2]}
+
+    def test_braces_inside_strings_are_ignored(self):
+        text = '{"note": "use {curly} and [square] brackets }"} trailing }'
+        block = extract_json_block(text)
+        assert json.loads(block) == {"note": "use {curly} and [square] brackets }"}
+
+    def test_escaped_quotes_do_not_end_the_string(self):
+        text = r'{"quote": "he said \"}\" loudly", "n": 1} and more'
+        block = extract_json_block(text)
+        assert json.loads(block) == {"quote": 'he said "}" loudly', "n": 1}
+
+    def test_escaped_backslash_before_closing_quote(self):
+        text = r'{"path": "C:\\", "n": 2} tail'
+        assert json.loads(extract_json_block(text)) == {"path": "C:\\", "n": 2}
+
+    def test_array_with_array_opener(self):
+        text = 'Items: [{"id": 0}, {"id": 1}] end'
+        assert json.loads(extract_json_block(text, opener="[")) == [{"id": 0}, {"id": 1}]
+
+    def test_object_opener_skips_to_first_object_inside_array(self):
+        text = '[{"id": 0}, {"id": 1}]'
+        assert extract_json_block(text) == '{"id": 0}'
+
+    def test_unbalanced_input_returns_none(self):
+        assert extract_json_block('{"a": {"b": 1}') is None
+        assert extract_json_block('{"a": "unterminated}') is None
+
+    def test_no_block_returns_none(self):
+        assert extract_json_block("no json here") is None
+        assert extract_json_block("") is None
+        assert extract_json_block(None) is None
+
+
+class TestKeywordMatcher:
+    """Unit tests for the memoized single-scan keyword matcher."""
+
+    def test_case_insensitive_and_lowercased(self):
+        find = keyword_matcher(("MTN", "Airtel"))
+        assert find("mtn and AIRTEL both") == {"mtn", "airtel"}
+
+    def test_prefix_keywords_are_reported_with_the_longer_match(self):
+        find = keyword_matcher(("MTN", "MTN MoMo"))
+        assert find("I use MTN MoMo daily") == {"mtn", "mtn momo"}
+        assert find("MTN network is down") == {"mtn"}
+
+    def test_overlapping_keywords_are_all_reported(self):
+        find = keyword_matcher(("mobile money", "money", "bank"))
+        assert find("Mobile money beats the bank") == {"mobile money", "money", "bank"}
+
+    def test_keyword_inside_a_longer_keyword(self):
+        find = keyword_matcher(("airtel money", "tel"))
+        assert find("airtel money") == {"airtel money", "tel"}
+
+    def test_no_matches_and_empty_inputs(self):
+        find = keyword_matcher(("mtn",))
+        assert find("nothing relevant") == set()
+        assert find("") == set()
+        assert find(None) == set()
+        assert keyword_matcher(())("mtn") == set()
+
+    def test_matchers_are_memoized(self):
+        assert keyword_matcher(("mtn", "airtel")) is keyword_matcher(("mtn", "airtel"))
+
+
+class TestTimestampHelpers:
+    """Unit tests for the ts_epoch helpers shared by the vector-store write and filter paths."""
+
+    def test_ts_epoch_parses_iso_strings_and_datetimes(self):
+        moment = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert ts_epoch("2024-01-01T00:00:00Z") == moment.timestamp()
+        assert ts_epoch(moment) == moment.timestamp()
+
+    def test_ts_epoch_rejects_unparseable_values(self):
+        assert ts_epoch("yesterday") is None
+        assert ts_epoch("") is None
+        assert ts_epoch(None) is None
+
+    def test_with_ts_epoch_adds_field_without_mutating(self):
+        metadata = {"timestamp": "2024-01-01T00:00:00+00:00", "source": "x"}
+        dated = with_ts_epoch(metadata)
+
+        assert dated["ts_epoch"] == ts_epoch(metadata["timestamp"])
+        assert dated["source"] == "x"
+        assert "ts_epoch" not in metadata
+
+    def test_with_ts_epoch_keeps_existing_and_undated_metadata(self):
+        existing = {"timestamp": "2024-01-01T00:00:00", "ts_epoch": 1.0}
+        undated = {"source": "x"}
+        assert with_ts_epoch(existing) is existing
+        assert with_ts_epoch(undated) is undated
+
+    def test_recent_filter(self):
+        assert recent_filter(None) is None
+        cutoff = recent_filter(24)["ts_epoch"]["$gte"]
+        assert abs(cutoff - (time.time() - 24 * 3600)) < 60
@@ -0,0 +1,44 @@
+import asyncio
+import sys
+import os
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.http_clients import PerLoopAsyncClient, run_sync
+
+
+class TestPerLoopAsyncClient:
+    """Unit tests for the per-event-loop async HTTP pool and the shared sync-to-async loop."""
+
+    def setup_method(self):
+        self.client = PerLoopAsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, text="ok")
+        ))
+
+    async def _get(self):
+        response = await self.client.get("https://llm.test/")
+        return response.text, self.client._loop_client()
+
+    def test_parent_transport_is_never_pooled(self):
+        assert not isinstance(self.client._transport, httpx.AsyncHTTPTransport)
+
+    def test_run_sync_reuses_one_pool_across_calls(self):
+        first_text, first_pool = run_sync(self._get())
+        second_text, second_pool = run_sync(self._get())
+
+        assert first_text == second_text == "ok"
+        assert first_pool is second_pool
+        assert not first_pool.is_closed
+
+    def test_release_loop_closes_a_short_lived_loops_pool(self):
+        async def request_and_release():
+            _, pool = await self._get()
+            await self.client.release_loop()
+            return pool
+
+        pool = asyncio.run(request_and_release())
+
+        assert pool.is_closed
+
@@ -60,4 +60,21 @@ class TestLangGraphWorkflow:
             mock_get.return_value = []
             result = self.workflow.fetch_data(state)
             assert "raw_posts" in result
-            assert isinstance(result["raw_posts"], list)
\ No newline at end of file
+            assert isinstance(result["raw_posts"], list)
+
+    def test_analyze_competitors_persists_mentions_in_bulk(self):
+        """Test that competitor mentions from one batched call are stored with one bulk insert"""
+        import unittest.mock
+        db_post = unittest.mock.Mock(cleaned_content="MTN MoMo is fast", content="MTN MoMo is fast")
+        mentions = [{"post_id": 7, "competitor": "MTN MoMo", "sentiment": "positive"}]
+        state = AgentState(processed_posts=[{"post_id": 7}], competitor_mentions=[], errors=[])
+
+        with unittest.mock.patch.object(self.workflow.db_manager, 'get_posts_by_ids', return_value={7: db_post}), \
+             unittest.mock.patch.object(self.workflow.db_manager, 'add_competitor_mentions_bulk') as mock_bulk, \
+             unittest.mock.patch.object(self.workflow.competitor_agent, 'process',
+                                        return_value={"competitor_mentions": mentions}) as mock_process:
+            result = self.workflow.analyze_competitors(state)
+
+        mock_process.assert_called_once_with({"posts": [{"id": 7, "text": "MTN MoMo is fast"}]})
+        mock_bulk.assert_called_once_with(mentions)
+        assert result["competitor_mentions"] == mentions
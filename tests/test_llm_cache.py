@@ -0,0 +1,53 @@
+import sys
+import os
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.llm_cache import LLMCache
+
+
+class TestLLMCache:
+    """Unit tests for the two-tier (in-process + Redis) LLM completion cache."""
+
+    def setup_method(self):
+        self.redis = Mock()
+        self.redis.get.return_value = None
+        self.cache = LLMCache(lambda: self.redis, namespace="test", ttl=60)
+
+    def test_key_covers_every_request_parameter(self):
+        base = dict(system="sys", model="llama", temperature=0.1, max_tokens=512)
+        key = self.cache.key("prompt", **base)
+
+        assert key == self.cache.key("prompt", **dict(base))
+        assert key.startswith("test:")
+        assert key != self.cache.key("other prompt", **base)
+        for name, value in (("system", "other sys"), ("model", "mixtral"),
+                            ("temperature", 0.7), ("max_tokens", 1024)):
+            assert key != self.cache.key("prompt", **{**base, name: value}), name
+
+    def test_redis_hit_is_promoted_into_memory_tier(self):
+        self.redis.get.return_value = b'{"cached": true}'
+        key = self.cache.key("prompt", model="llama")
+
+        assert self.cache.get(key) == '{"cached": true}'
+        assert self.cache.get(key) == '{"cached": true}'
+
+        # The second lookup is answered in-process without another Redis round trip
+        self.redis.get.assert_called_once_with(key)
+        assert self.cache.stats == {"hits": 2, "misses": 0}
+
+    def test_set_writes_both_tiers(self):
+        self.cache.set("test:k", '{"a": 1}')
+
+        self.redis.setex.assert_called_once_with("test:k", 60, b'{"a": 1}')
+        assert self.cache.get("test:k") == '{"a": 1}'
+        self.redis.get.assert_not_called()
+
+    def test_redis_errors_are_misses(self):
+        self.redis.get.side_effect = ConnectionError("redis down")
+        self.redis.setex.side_effect = ConnectionError("redis down")
+
+        assert self.cache.get("test:missing") is None
+        self.cache.set("test:k", "value")
+        assert self.cache.stats == {"hits": 0, "misses": 1}
@@ -0,0 +1,39 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.rerank import mmr
+
+
+class TestMMR:
+    """Unit tests for the Maximal Marginal Relevance re-ranker."""
+
+    def setup_method(self):
+        self.query = [1.0, 0.1]
+        # A near-duplicate pair plus one unrelated, distinct document
+        self.candidates = [
+            [1.0, 0.0],    # 0: relevant
+            [1.0, 0.01],   # 1: most relevant, near-duplicate of 0
+            [0.0, 1.0],    # 2: barely relevant, but different
+        ]
+
+    def test_pure_relevance_orders_by_similarity(self):
+        """With lambda_mult=1.0 MMR is plain nearest-neighbour ordering."""
+        assert mmr(self.query, self.candidates, k=3, lambda_mult=1.0) == [1, 0, 2]
+
+    def test_diversity_penalty_skips_near_duplicates(self):
+        """The most relevant document comes first; its near-duplicate is passed over."""
+        assert mmr(self.query, self.candidates, k=2, lambda_mult=0.3) == [1, 2]
+
+    def test_k_larger_than_candidates_returns_all_once(self):
+        selected = mmr(self.query, self.candidates, k=10)
+        assert sorted(selected) == [0, 1, 2]
+
+    def test_empty_and_zero_k(self):
+        assert mmr(self.query, [], k=5) == []
+        assert mmr(self.query, self.candidates, k=0) == []
+
+    def test_zero_vector_candidate_does_not_fail(self):
+        selected = mmr(self.query, [[0.0, 0.0], [1.0, 0.0]], k=2)
+        assert selected[0] == 1
@@ -1,4 +1,4 @@
-from .helpers import format_timestamp, time_ago, chunk_list, safe_json_loads
+from .helpers import format_timestamp, time_ago, chunk_list, safe_json_loads, keyword_matcher, extract_json_block, ts_epoch, with_ts_epoch, recent_filter
 from .logger import setup_logger, app_logger
 
-__all__ = ['format_timestamp', 'time_ago', 'chunk_list', 'safe_json_loads', 'setup_logger', 'app_logger']
\ No newline at end of file
+__all__ = ['format_timestamp', 'time_ago', 'chunk_list', 'safe_json_loads', 'keyword_matcher', 'extract_json_block', 'ts_epoch', 'with_ts_epoch', 'recent_filter', 'setup_logger', 'app_logger']
\ No newline at end of file
@@ -11,6 +11,13 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Basic regex patterns for common PII, compiled once since every fetched post passes through here
+_PII_PATTERNS = (
+    (re.compile(r'@[A-Za-z0-9_]+'), '[REDACTED_USER]'),  # Usernames
+    (re.compile(r'\+256[0-9]{9}\b'), '[REDACTED_PHONE]'),  # Uganda phone numbers
+    (re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'), '[REDACTED_EMAIL]')  # Emails
+)
+
 def anonymize_text(text: str, logger: logging.Logger) -> str:
     """Anonymize PII from input text to comply with Uganda's Data Protection Act.
 
@@ -22,16 +29,9 @@ def anonymize_text(text: str, logger: logging.Logger) -> str:
         str: Anonymized text with PII redacted.
     """
     try:
-        # Basic regex patterns for common PII
-        patterns = [
-            (r'@[A-Za-z0-9_]+', '[REDACTED_USER]'),  # Usernames
-            (r'\+256[0-9]{9}\b', '[REDACTED_PHONE]'),  # Uganda phone numbers
-            (r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', '[REDACTED_EMAIL]')  # Emails
-        ]
-        
         anonymized_text = text
-        for pattern, replacement in patterns:
-            anonymized_text = re.sub(pattern, replacement, anonymized_text)
+        for pattern, replacement in _PII_PATTERNS:
+            anonymized_text = pattern.sub(replacement, anonymized_text)
 
         # Optional Presidio for advanced PII detection
         if os.getenv('USE_PRESIDIO', 'false').lower() == 'true':
@@ -1,6 +1,9 @@
+import functools
 import json
+import re
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional, Set, Tuple
 
 def format_timestamp(dt):
     """Format datetime for display"""
@@ -20,6 +23,72 @@ def time_ago(dt):
     else:
         return "just now"
 
+# Only the characters that change bracket depth or string state matter to the scanner
+_JSON_SCAN_RE = re.compile(r'[{}\[\]"\\]')
+_JSON_CLOSERS = {"{": "}", "[": "]"}
+
+def extract_json_block(text: str, opener: str = "{") -> Optional[str]:
+    """Return the first balanced JSON object (or array, with opener="[") embedded in text.
+
+    Scans once from the first opener, tracking bracket depth and string/escape state,
+    so braces inside string values are ignored and no regex backtracking is involved.
+    Returns None when no complete block is found.
+    """
+    start = text.find(opener) if text else -1
+    if start < 0:
+        return None
+    closer = _JSON_CLOSERS[opener]
+    depth = 0
+    in_string = False
+    skip_to = start
+    for match in _JSON_SCAN_RE.finditer(text, start):
+        pos = match.start()
+        if pos < skip_to:
+            continue
+        char = match.group()
+        if in_string:
+            if char == "\\":
+                skip_to = pos + 2
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == opener:
+            depth += 1
+        elif char == closer:
+            depth -= 1
+            if depth == 0:
+                return text[start:pos + 1]
+    return None
+
+def ts_epoch(timestamp: Any) -> Optional[float]:
+    """Numeric form of a stored timestamp (datetime or ISO string); None when it cannot be parsed.
+
+    Chroma's $gt/$gte/$lt/$lte operators only compare numbers, so vector-store records
+    carry this next to their ISO ``timestamp`` for recency filters and retention deletes.
+    """
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    if isinstance(timestamp, str) and timestamp:
+        try:
+            return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+def with_ts_epoch(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a record's metadata with ``ts_epoch`` added from its ``timestamp``, when parseable."""
+    if "ts_epoch" in metadata:
+        return metadata
+    epoch = ts_epoch(metadata.get("timestamp"))
+    return metadata if epoch is None else {**metadata, "ts_epoch": epoch}
+
+def recent_filter(hours: Optional[int]) -> Optional[Dict[str, Any]]:
+    """Chroma ``where`` predicate for records from the last ``hours`` hours; None means no limit."""
+    if hours is None:
+        return None
+    return {"ts_epoch": {"$gte": time.time() - hours * 3600}}
+
 def chunk_list(lst, n):
     """Split a list into chunks of size n"""
     for i in range(0, len(lst), n):
@@ -32,4 +101,30 @@ def safe_json_loads(json_str, default=None):
     try:
         return json.loads(json_str)
     except (json.JSONDecodeError, TypeError):
-        return default
\ No newline at end of file
+        return default
+
+@functools.lru_cache(maxsize=32)
+def keyword_matcher(keywords: Tuple[str, ...]) -> Callable[[str], Set[str]]:
+    """Build a function returning which keywords occur in a text, scanning it once.
+
+    Matching is case-insensitive and returns lowercased keywords. Overlapping
+    keywords are all reported, including ones that are a prefix of a longer match.
+    Matchers are memoized per keyword tuple.
+    """
+    names = sorted({keyword.lower() for keyword in keywords if keyword}, key=len, reverse=True)
+    if not names:
+        return lambda text: set()
+
+    pattern = re.compile(f"(?=({'|'.join(map(re.escape, names))}))", re.IGNORECASE)
+    # The alternation reports only the longest keyword at each position
+    prefixes = {name: [other for other in names if other != name and name.startswith(other)] for name in names}
+
+    def find(text: str) -> Set[str]:
+        hits = set()
+        for match in pattern.finditer(text or ""):
+            name = match.group(1).lower()
+            hits.add(name)
+            hits.update(prefixes[name])
+        return hits
+
+    return find
@@ -0,0 +1,126 @@
+import asyncio
+import atexit
+import functools
+import importlib.util
+import threading
+import weakref
+from typing import Any, Coroutine, Optional, TypeVar
+
+import httpx
+
+from config import Config
+
+T = TypeVar("T")
+
+
+class _UnusedTransport(httpx.AsyncBaseTransport):
+    """Stands in for the parent transport of PerLoopAsyncClient so no idle pool is built."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        raise RuntimeError("PerLoopAsyncClient sends through its per-loop clients")
+
+
+class PerLoopAsyncClient(httpx.AsyncClient):
+    """AsyncClient that sends each request through a pool owned by the running event loop.
+
+    Pooled connections are bound to the loop that opened them, so one shared AsyncClient
+    would hand a new loop a connection from an earlier, closed one and fail with
+    ``RuntimeError: Event loop is closed``. This client keeps one inner AsyncClient per
+    loop instead. The sync entry points all run on the single loop behind ``run_sync``,
+    so in practice one pool is reused; other loops should call ``release_loop`` before
+    they finish. It subclasses AsyncClient only because the Groq and OpenAI SDKs check
+    for one; the parent's own transport is a placeholder that is never used.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**{**kwargs, "transport": _UnusedTransport(), "trust_env": False})
+        self._client_kwargs = kwargs
+        self._loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _loop_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._loop_clients.get(loop)
+        if client is None or client.is_closed:
+            client = self._loop_clients[loop] = httpx.AsyncClient(**self._client_kwargs)
+        return client
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        return await self._loop_client().send(request, **kwargs)
+
+    async def release_loop(self) -> None:
+        """Close the running loop's pool; call before a short-lived loop shuts down."""
+        client = self._loop_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def aclose(self) -> None:
+        """Close the current loop's pool along with this client."""
+        try:
+            await self.release_loop()
+        except RuntimeError:
+            pass
+        await super().aclose()
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Start (once) the daemon thread whose event loop runs every ``run_sync`` call."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-http-loop", daemon=True).start()
+            atexit.register(_stop_background_loop, loop)
+            _loop = loop
+        return _loop
+
+
+def _stop_background_loop(loop: asyncio.AbstractEventLoop) -> None:
+    if get_http_clients.cache_info().currsize:
+        asyncio.run_coroutine_threadsafe(get_http_clients()[1].release_loop(), loop).result(timeout=5)
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion from synchronous code and return its result.
+
+    Unlike ``asyncio.run`` this reuses one long-lived event loop, so the async HTTP pool
+    (and its keep-alive and TLS sessions) carries over from one call to the next. Must
+    not be called from inside a running event loop.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+async def release_loop_pool() -> None:
+    """Close the shared async client's pool for the running loop, if one was opened."""
+    if get_http_clients.cache_info().currsize:
+        await get_http_clients()[1].release_loop()
+
+
+# Process-wide pool: the Groq chat models and the Azure embedding clients all
+# send their requests through these two clients, so keep-alive connections are
+# reused across agents, the topic extractor and the vector store.
+@functools.lru_cache(maxsize=None)
+def get_http_clients():
+    """Pooled sync/async HTTP clients shared by every LLM and embedding client in the process.
+
+    The sync client is one pool for the whole process; the async client keeps a separate
+    pool per event loop (see PerLoopAsyncClient and run_sync). HTTP/2 is used when the optional ``h2``
+    package is installed; otherwise the pools still keep HTTP/1.1 connections alive.
+    """
+    http2 = importlib.util.find_spec("h2") is not None
+    limits = httpx.Limits(
+        max_connections=Config.LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.LLM_HTTP_MAX_KEEPALIVE
+    )
+    # Generous read timeout for long completions; connecting should fail fast
+    timeout = httpx.Timeout(Config.LLM_HTTP_TIMEOUT, connect=10.0)
+    return (
+        httpx.Client(http2=http2, limits=limits, timeout=timeout),
+        PerLoopAsyncClient(http2=http2, limits=limits, timeout=timeout)
+    )
@@ -0,0 +1,89 @@
+import asyncio
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import orjson
+from cachetools import TTLCache
+
+from utils.logger import app_logger
+
+
+class LLMCache:
+    """Two-tier cache of LLM completions keyed on the exact request.
+
+    The key covers the model, sampling parameters and prompt, so any change to one of
+    them is a miss. A bounded in-process TTL/LRU tier answers repeats without a network
+    round trip; Redis behind it shares completions across processes and restarts.
+    Redis errors are logged and treated as misses; the cache never makes an LLM call fail.
+    """
+
+    def __init__(self, client_factory: Callable[[], Any], namespace: str = "llm", ttl: int = 3600,
+                 local_maxsize: int = 256):
+        """
+        Args:
+            client_factory (Callable[[], Any]): Returns the Redis client; called on first use.
+            namespace (str): Key prefix separating callers sharing one Redis.
+            ttl (int): Default time-to-live in seconds for stored completions.
+            local_maxsize (int): Completions kept in the in-process tier (least recently used evicted).
+        """
+        self._client_factory = client_factory
+        self.namespace = namespace
+        self.ttl = ttl
+        self._local = TTLCache(maxsize=local_maxsize, ttl=ttl)
+        self._local_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def key(self, prompt: str, **params: Any) -> str:
+        """Cache key for a prompt and the request parameters (model, temperature, ...)."""
+        payload = orjson.dumps({"prompt": prompt, **params}, option=orjson.OPT_SORT_KEYS, default=str)
+        return f"{self.namespace}:{hashlib.sha256(payload).hexdigest()}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion text, or None on a miss."""
+        with self._local_lock:
+            value = self._local.get(key)
+        if value is None:
+            try:
+                value = self._client_factory().get(key)
+            except Exception as e:
+                app_logger.error(f"LLM cache lookup failed: {e}")
+                value = None
+            if isinstance(value, bytes):
+                value = value.decode()
+            if value is not None:
+                with self._local_lock:
+                    self._local[key] = value
+        self._record(value is not None)
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        """Store a completion text under key."""
+        with self._local_lock:
+            self._local[key] = value
+        try:
+            self._client_factory().setex(key, ttl or self.ttl, value.encode())
+        except Exception as e:
+            app_logger.error(f"LLM cache write failed: {e}")
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Async variant of get; the Redis call runs off the event loop."""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        """Async variant of set; the Redis call runs off the event loop."""
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters since this cache was created."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _record(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
@@ -0,0 +1,50 @@
+import numpy as np
+from typing import List, Sequence
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so dot products are cosine similarities."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def mmr(query_embedding: Sequence[float], candidate_embeddings: Sequence[Sequence[float]],
+        k: int = 5, lambda_mult: float = 0.5) -> List[int]:
+    """Select k candidates by Maximal Marginal Relevance.
+
+    Args:
+        query_embedding (Sequence[float]): Embedding of the query.
+        candidate_embeddings (Sequence[Sequence[float]]): Embeddings of the candidate documents.
+        k (int): Number of candidates to select.
+        lambda_mult (float): Trade-off between relevance (1.0) and diversity (0.0).
+
+    Returns:
+        List[int]: Indices into candidate_embeddings, in selection order.
+    """
+    candidates = np.ascontiguousarray(candidate_embeddings, dtype=np.float32)
+    if candidates.ndim != 2 or len(candidates) == 0 or k <= 0:
+        return []
+
+    candidates = _normalize(candidates)
+    query = _normalize(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+
+    # Both similarity tables are computed once as matrix products; the greedy loop
+    # below only does O(n) vector updates per pick.
+    relevance = candidates @ query
+    pairwise = candidates @ candidates.T
+
+    selected = [int(np.argmax(relevance))]
+    max_redundancy = pairwise[selected[0]].copy()
+    available = np.ones(len(candidates), dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < min(k, len(candidates)):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_redundancy, pairwise[best], out=max_redundancy)
+
+    return selected
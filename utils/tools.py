@@ -4,7 +4,6 @@ import os
 import tweepy
 import logging
 from dotenv import load_dotenv
-import tweepy
 from datetime import datetime
 from utils.compliance import anonymize_text
 from utils.logger import setup_logger